@@ -23,7 +23,7 @@ import sqlite3
 import argparse
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 import json
 import logging
 
@@ -45,13 +45,22 @@ class BlacklistRewind:
     the last X days, effectively "rewinding" their reading history.
     """
     
-    def __init__(self, database_path: Path, config=None, logger: Optional[logging.Logger] = None):
-        """Initialize the rewind tool."""
+    def __init__(self, database_path: Union[Path, str], config=None,
+                 logger: Optional[logging.Logger] = None, backup_dir: Optional[Path] = None):
+        """
+        Initialize the rewind tool.
+        
+        database_path may also be a SQLite "file:" URI (e.g. a shared-cache
+        in-memory database); backups then default to ./backups unless
+        backup_dir is given.
+        """
         self.db_path = database_path
+        self.db_uri = str(database_path) if str(database_path).startswith("file:") else None
+        self.backup_dir = Path(backup_dir) if backup_dir else Path(database_path).parent / "backups"
         self.config = config
         self.logger = logger or self._setup_logger()
         
-        if not self.db_path.exists():
+        if self.db_uri is None and not self.db_path.exists():
             raise FileNotFoundError(f"Database not found at {self.db_path}")
             
         self.logger.info(f"BlacklistRewind initialized with database: {self.db_path}")
@@ -69,9 +78,13 @@ class BlacklistRewind:
         
         return logger
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the links database."""
+        return sqlite3.connect(self.db_uri or self.db_path, uri=self.db_uri is not None)
+    
     def get_blacklist_statistics(self) -> Dict:
         """Get current blacklist statistics."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # Total blacklisted links
@@ -125,7 +138,7 @@ class BlacklistRewind:
         """
         cutoff_date = date.today() - timedelta(days=days)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # Find links that would be restored (un-blacklisted)
@@ -172,16 +185,20 @@ class BlacklistRewind:
         """
         Create a backup of current blacklist state.
         
+        The backup is a single JSON document. Its summary (backup date,
+        database path, total_blacklisted) is also written to a ".meta"
+        sidecar so it can be read without parsing every link.
+        
         Returns:
             Path to backup file
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_dir = self.db_path.parent / "backups"
-        backup_dir.mkdir(exist_ok=True)
+        backup_dir = self.backup_dir
+        backup_dir.mkdir(parents=True, exist_ok=True)
         
         backup_file = backup_dir / f"blacklist_backup_{timestamp}.json"
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # Export all blacklisted links
@@ -205,16 +222,19 @@ class BlacklistRewind:
                     'url_hash': row[7]
                 })
         
-        backup_content = {
+        summary = {
             'backup_date': datetime.now().isoformat(),
             'database_path': str(self.db_path),
-            'total_blacklisted': len(blacklist_data),
-            'blacklisted_links': blacklist_data
+            'total_blacklisted': len(blacklist_data)
         }
+        backup_content = dict(summary, blacklisted_links=blacklist_data)
         
         with open(backup_file, 'w') as f:
             json.dump(backup_content, f, indent=2, default=str)
         
+        with open(self._summary_file(backup_file), 'w') as f:
+            json.dump(summary, f, default=str)
+        
         self.logger.info(f"Backup created: {backup_file}")
         return backup_file
     
@@ -236,7 +256,7 @@ class BlacklistRewind:
         
         cutoff_date = date.today() - timedelta(days=days)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # Get links that will be restored for reporting
@@ -276,6 +296,50 @@ class BlacklistRewind:
             'backup_file': str(backup_file) if backup_file else None
         }
     
+    @staticmethod
+    def _summary_file(backup_file: Path) -> Path:
+        """The ".meta" sidecar holding a backup's summary."""
+        return backup_file.with_suffix(".meta")
+    
+    @staticmethod
+    def _load_backup(backup_file: Path, summary_only: bool = False) -> Dict:
+        """
+        Load a backup file, with or without its link list.
+        
+        Also reads backups from builds that put a one-line JSON summary
+        in front of the document instead of in a sidecar.
+        """
+        with open(backup_file, 'r') as f:
+            first_line = f.readline()
+            try:
+                header = json.loads(first_line)
+            except json.JSONDecodeError:
+                header = None
+            
+            if isinstance(header, dict) and 'blacklisted_links' not in header:
+                return header if summary_only else json.load(f)
+            
+            backup_data = header if header is not None else json.loads(first_line + f.read())
+        
+        if summary_only:
+            backup_data = {k: v for k, v in backup_data.items() if k != 'blacklisted_links'}
+        return backup_data
+    
+    def read_backup_summary(self, backup_file: Path) -> Dict:
+        """
+        Return a backup's date, database path and total_blacklisted
+        without loading its link list.
+        """
+        if not backup_file.exists():
+            raise FileNotFoundError(f"Backup file not found: {backup_file}")
+        
+        try:
+            with open(self._summary_file(backup_file), 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            # No sidecar (older backup): fall back to loading the file
+            return self._load_backup(backup_file, summary_only=True)
+    
     def restore_from_backup(self, backup_file: Path) -> Dict:
         """
         Restore blacklist from a backup file.
@@ -289,12 +353,11 @@ class BlacklistRewind:
         if not backup_file.exists():
             raise FileNotFoundError(f"Backup file not found: {backup_file}")
         
-        with open(backup_file, 'r') as f:
-            backup_data = json.load(f)
+        backup_data = self._load_backup(backup_file)
         
         blacklisted_links = backup_data.get('blacklisted_links', [])
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             restored_count = 0
@@ -333,7 +396,7 @@ class BlacklistRewind:
         """List recently blacklisted links for review."""
         cutoff_date = date.today() - timedelta(days=days)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -115,6 +115,11 @@ class Config:
     DUPLICATE_DETECTION_ENABLED = True     # Prevent duplicate link opening
     BLACKLIST_CLEANUP_DAYS = 90            # Days to keep blacklisted link history
     RECENT_LINK_DAYS = 1                   # Don't re-open links opened within this many days
+    SQLITE_PRAGMAS = [                     # Applied to each link database connection
+        'journal_mode=WAL',                # Inserts append to the WAL; readers don't block the writer
+        'synchronous=NORMAL',              # fsync at checkpoints, not on every commit
+        'busy_timeout=5000'                # Wait up to 5s for a lock instead of failing
+    ]
     
     # Link Management Behavior
     BLACKLIST_ON_ERROR = False             # Auto-blacklist links that fail to load
@@ -15,12 +15,22 @@ Version: 1.5.0
 import sqlite3
 import hashlib
 import json
+import copy
 import fnmatch
+from collections import OrderedDict
+from contextlib import closing, contextmanager
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Set, Tuple
+from typing import List, Dict, Optional, Set, Tuple, Union
 from urllib.parse import urlparse
 import logging
+import threading
+
+# Defaults for settings a caller's config may leave out
+try:
+    from config import Config as DefaultConfig
+except ImportError:
+    DefaultConfig = None
 
 __version__ = "1.5.0"
 
@@ -37,23 +47,134 @@ class LinkManager:
     - Link history and change detection
     """
     
-    def __init__(self, database_path: Path, config=None, logger: Optional[logging.Logger] = None):
-        """Initialize LinkManager with database path and configuration."""
-        self.db_path = database_path
+    # Prepared statements kept per connection (sqlite3 default is 128)
+    STATEMENT_CACHE_SIZE = 128
+    
+    # IN-clause sizes used by batched link lookups
+    LOOKUP_BUCKETS = (1, 8, 64, 512)
+    
+    # Recent analyze_newsletter_links results kept per LinkManager
+    ANALYSIS_CACHE_SIZE = 32
+    
+    # The batched record path upserts with INSERT ... ON CONFLICT DO UPDATE
+    UPSERT_MIN_SQLITE = (3, 24, 0)
+    
+    def __init__(self, database_path: Union[Path, str], config=None, logger: Optional[logging.Logger] = None):
+        """
+        Initialize LinkManager with database path and configuration.
+        
+        Pass ":memory:" as database_path for a private in-memory database
+        that lives as long as this LinkManager (useful for tests). A
+        "file:" URI is opened in SQLite URI mode, e.g.
+        "file:links?mode=memory&cache=shared" for an in-memory database
+        shared with other connections in the same process.
+        """
+        self.db_path = Path(database_path)
+        self.db_uri = str(database_path) if str(database_path).startswith("file:") else None
+        self.in_memory = (str(database_path) == ":memory:" or
+                          (self.db_uri is not None and "mode=memory" in self.db_uri))
         self.config = config
         self.logger = logger or logging.getLogger(__name__)
+        self._conn: Optional[sqlite3.Connection] = None
+        # Serializes use of the shared connection across threads, so reads
+        # never see another thread's uncommitted writes (also guards the
+        # analysis cache); reentrant so _transaction can nest
+        self._lock = threading.RLock()
+        self._today = date.today  # Clock for recency checks; tests may swap it
+        
+        # (links, cutoff, data_version, total_changes) -> analysis result
+        self._analysis_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
         
         # Ensure parent directory exists
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.in_memory and self.db_uri is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Initialize database
         self._init_database()
         
         self.logger.info(f"LinkManager initialized with database: {self.db_path}")
     
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return the shared database connection, opening it on first use.
+        
+        The connection lives as long as the LinkManager so sqlite3's
+        per-connection statement cache keeps the hot queries prepared
+        across analyze/record calls instead of re-parsing them every time.
+        
+        The connection may be used from any thread and runs in autocommit
+        mode; writes open their own transactions in _transaction().
+        """
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    conn = sqlite3.connect(self.db_uri or self.db_path, uri=self.db_uri is not None,
+                                           cached_statements=self.STATEMENT_CACHE_SIZE,
+                                           check_same_thread=False, isolation_level=None)
+                    
+                    pragmas = getattr(self.config, 'SQLITE_PRAGMAS',
+                                      getattr(DefaultConfig, 'SQLITE_PRAGMAS', ()))
+                    for pragma in pragmas:
+                        conn.execute(f"PRAGMA {pragma}")
+                    
+                    self._conn = conn
+        
+        return self._conn
+    
+    def close(self) -> None:
+        """Close the shared database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    @contextmanager
+    def _transaction(self):
+        """
+        Run a block of writes as one BEGIN IMMEDIATE ... COMMIT transaction.
+        
+        If the shared connection is already inside a transaction (e.g. a test
+        bracketing its scenarios in BEGIN ... ROLLBACK), the block runs in a
+        SAVEPOINT instead so the caller's transaction is never committed.
+        
+        Holds the connection lock, so other threads neither write nor read
+        until the transaction ends.
+        """
+        with self._lock:
+            conn = self._connect()
+            
+            if conn.in_transaction:
+                conn.execute("SAVEPOINT link_manager")
+                try:
+                    yield conn
+                except Exception:
+                    conn.execute("ROLLBACK TO link_manager")
+                    conn.execute("RELEASE link_manager")
+                    raise
+                else:
+                    conn.execute("RELEASE link_manager")
+                return
+            
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+            finally:
+                self._analysis_cache.clear()
+    
+    @contextmanager
+    def _reading(self):
+        """Yield a cursor on the shared connection while holding its lock."""
+        with self._lock, closing(self._connect().cursor()) as cursor:
+            yield cursor
+    
     def _init_database(self) -> None:
         """Initialize the SQLite database with required tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
             # Create links table - stores all unique links ever encountered
@@ -106,14 +227,18 @@ class LinkManager:
             """)
             
             # Create indexes for better performance
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_links_url_hash ON links(url_hash);")
+            # url_hash lookups use the UNIQUE constraint's index; a separate
+            # idx_links_url_hash only doubled the index writes on every insert
+            cursor.execute("DROP INDEX IF EXISTS idx_links_url_hash;")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_links_domain ON links(domain);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_links_blacklisted ON links(is_blacklisted);")
+            # Rewind/preview filter on is_blacklisted and a blacklisted_date range;
+            # the composite index also serves is_blacklisted-only lookups
+            cursor.execute("DROP INDEX IF EXISTS idx_links_blacklisted;")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_links_blacklisted_date ON links(is_blacklisted, blacklisted_date);")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_newsletter_runs_date ON newsletter_runs(run_date);")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_link_appearances_link_id ON link_appearances(link_id);")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_link_appearances_run_id ON link_appearances(run_id);")
             
-            conn.commit()
             self.logger.info("Database schema initialized successfully")
     
     def _hash_url(self, url: str) -> str:
@@ -125,6 +250,22 @@ class LinkManager:
             normalized += f"?{parsed.query}"
         return hashlib.md5(normalized.encode()).hexdigest()
     
+    def _hash_links(self, links: List[str], action: str) -> List[Tuple[int, str, str]]:
+        """
+        Hash many URLs, returning (position, url, url_hash) for each one.
+        
+        Positions are 1-based within links. A URL that can't be parsed
+        (e.g. "http://[bad/x") is logged and left out instead of failing
+        the whole batch.
+        """
+        hashed = []
+        for position, url in enumerate(links, 1):
+            try:
+                hashed.append((position, url, self._hash_url(url)))
+            except Exception as e:
+                self.logger.error(f"Error {action} link {url}: {e}")
+        return hashed
+    
     def _extract_domain(self, url: str) -> str:
         """Extract domain from URL."""
         try:
@@ -161,7 +302,7 @@ class LinkManager:
         days_old = getattr(self.config, 'AUTO_BLACKLIST_DAYS', 30)
         cutoff_date = date.today() - timedelta(days=days_old)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -179,6 +320,37 @@ class LinkManager:
             
             return count
     
+    def _lookup_links(self, cursor: sqlite3.Cursor, url_hashes: List[str],
+                      recent_cutoff: str) -> Dict[str, Tuple]:
+        """
+        Fetch (id, is_blacklisted, last_seen, is_recent) for many URL hashes at once.
+        
+        is_recent is computed by SQLite as ``last_seen >= recent_cutoff``
+        (ISO dates compare correctly as text) and is falsy when last_seen
+        is NULL. Hashes are looked up with ``url_hash IN (...)`` queries whose size is
+        rounded up to one of LOOKUP_BUCKETS (padding with NULLs, which never
+        match), so only a handful of distinct SQL strings reach the
+        prepared-statement cache.
+        """
+        found = {}
+        unique_hashes = list(dict.fromkeys(url_hashes))
+        largest_bucket = self.LOOKUP_BUCKETS[-1]
+        
+        for start in range(0, len(unique_hashes), largest_bucket):
+            chunk = unique_hashes[start:start + largest_bucket]
+            bucket = next(size for size in self.LOOKUP_BUCKETS if size >= len(chunk))
+            placeholders = ",".join("?" * bucket)
+            
+            cursor.execute(f"""
+                SELECT url_hash, id, is_blacklisted, last_seen, last_seen >= ?
+                FROM links WHERE url_hash IN ({placeholders})
+            """, [recent_cutoff] + chunk + [None] * (bucket - len(chunk)))
+            
+            for url_hash, link_id, is_blacklisted, last_seen, is_recent in cursor.fetchall():
+                found[url_hash] = (link_id, is_blacklisted, last_seen, is_recent)
+        
+        return found
+    
     def process_newsletter_links(self, links: List[str], newsletter_hash: str = None) -> Dict:
         """
         Process a list of newsletter links and return categorized results.
@@ -217,7 +389,7 @@ class LinkManager:
         if aged_count > 0:
             result['statistics']['auto_blacklisted_aged'] = aged_count
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
             # Create newsletter run record
@@ -313,8 +485,6 @@ class LinkManager:
                 result['statistics']['opened_count'],
                 run_id
             ))
-            
-            conn.commit()
         
         # Log summary
         stats = result['statistics']
@@ -346,6 +516,38 @@ class LinkManager:
                 'statistics': {'total_links': 0, 'new_count': 0, 'existing_count': 0, 'blacklisted_count': 0}
             }
         
+        # Links last opened on or after this date are too recent to re-open
+        recent_days_threshold = getattr(self.config, 'RECENT_LINK_DAYS', 3)
+        recent_cutoff = (self._today() - timedelta(days=recent_days_threshold)).isoformat()
+        
+        with self._lock:
+            conn = self._connect()
+            
+            # Results inside an open transaction may be rolled back, so only
+            # cache outside one. data_version moves when another connection
+            # commits and total_changes when this one writes, so either makes
+            # older entries unreachable.
+            if conn.in_transaction:
+                return self._analyze_links(links, recent_cutoff)
+            
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            key = (tuple(links), recent_cutoff, data_version, conn.total_changes)
+            
+            cached = self._analysis_cache.get(key)
+            if cached is None:
+                cached = self._analyze_links(links, recent_cutoff)
+                self._analysis_cache[key] = cached
+                if len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                    self._analysis_cache.popitem(last=False)
+            else:
+                self._analysis_cache.move_to_end(key)
+                self.logger.debug(f"Reusing cached analysis of {len(links)} links")
+        
+        # Callers may mutate the lists they get back
+        return copy.deepcopy(cached)
+    
+    def _analyze_links(self, links: List[str], recent_cutoff: str) -> Dict:
+        """Categorize links against the database (see analyze_newsletter_links)."""
         result = {
             'new_links': [],
             'existing_links': [],
@@ -359,14 +561,15 @@ class LinkManager:
             }
         }
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._reading() as cursor:
+            # Fetch every already-known link in one batched lookup
+            hashed = self._hash_links(links, "analyzing")
+            known_links = self._lookup_links(cursor, [url_hash for _, _, url_hash in hashed],
+                                             recent_cutoff)
             
             # Analyze each link without storing
-            for url in links:
+            for _, url, url_hash in hashed:
                 try:
-                    url_hash = self._hash_url(url)
-                    
                     # Check if URL should be auto-blacklisted based on patterns
                     auto_blacklist_reason = self._should_auto_blacklist_url(url)
                     if auto_blacklist_reason:
@@ -375,55 +578,23 @@ class LinkManager:
                         continue
                     
                     # Check if link already exists and its status
-                    cursor.execute("""
-                        SELECT id, is_blacklisted, last_seen
-                        FROM links WHERE url_hash = ?
-                    """, (url_hash,))
-                    
-                    existing_link = cursor.fetchone()
+                    existing_link = known_links.get(url_hash)
                     
                     if existing_link:
-                        link_id, is_blacklisted, last_seen_str = existing_link
+                        link_id, is_blacklisted, last_seen, is_recent = existing_link
                         
                         if is_blacklisted:
                             result['blacklisted_links'].append(url)
                             result['statistics']['blacklisted_count'] += 1
+                        elif is_recent:
+                            # Don't re-open links that were opened recently
+                            result['blacklisted_links'].append(url)
+                            result['statistics']['blacklisted_count'] += 1
+                            self.logger.debug(f"Skipping recently opened link (last opened {last_seen}): {url}")
                         else:
-                            # Check if link was opened recently (within last few days)
-                            from datetime import datetime, date
-                            
-                            # Parse last_seen date
-                            if last_seen_str:
-                                try:
-                                    if isinstance(last_seen_str, str):
-                                        last_seen_date = datetime.strptime(last_seen_str, '%Y-%m-%d').date()
-                                    else:
-                                        last_seen_date = last_seen_str
-                                    
-                                    days_since_opened = (date.today() - last_seen_date).days
-                                    
-                                    # Don't re-open links that were opened recently
-                                    recent_days_threshold = getattr(self.config, 'RECENT_LINK_DAYS', 3)
-                                    
-                                    if days_since_opened <= recent_days_threshold:
-                                        result['blacklisted_links'].append(url)
-                                        result['statistics']['blacklisted_count'] += 1
-                                        self.logger.debug(f"Skipping recently opened link ({days_since_opened} days ago): {url}")
-                                    else:
-                                        result['existing_links'].append(url)
-                                        result['statistics']['existing_count'] += 1
-                                        result['links_to_open'].append(url)
-                                        
-                                except (ValueError, TypeError):
-                                    # If date parsing fails, treat as normal existing link
-                                    result['existing_links'].append(url)
-                                    result['statistics']['existing_count'] += 1
-                                    result['links_to_open'].append(url)
-                            else:
-                                # No last_seen date, treat as normal existing link
-                                result['existing_links'].append(url)
-                                result['statistics']['existing_count'] += 1
-                                result['links_to_open'].append(url)
+                            result['existing_links'].append(url)
+                            result['statistics']['existing_count'] += 1
+                            result['links_to_open'].append(url)
                     else:
                         # New link - add to open list
                         result['new_links'].append(url)
@@ -441,7 +612,8 @@ class LinkManager:
             
             return result
     
-    def record_opened_links(self, links: List[str], newsletter_hash: str = None) -> Dict:
+    def record_opened_links(self, links: List[str], newsletter_hash: str = None,
+                            batch: bool = True) -> Dict:
         """
         Record links that were actually opened in the browser.
         This should only be called AFTER links have been successfully opened.
@@ -449,6 +621,11 @@ class LinkManager:
         Args:
             links: List of URLs that were successfully opened
             newsletter_hash: Optional hash of newsletter content for change tracking
+            batch: Write all links with executemany inside a single
+                BEGIN IMMEDIATE transaction (default). Pass False to write
+                row by row, logging and skipping any link that fails. SQLite
+                older than 3.24 lacks upsert and always uses the row path,
+                and a batch that fails is retried row by row
             
         Returns:
             Dict with recording statistics
@@ -463,7 +640,22 @@ class LinkManager:
         # Run auto-blacklisting for old links if enabled
         aged_count = self._auto_blacklist_old_links()
         
-        with sqlite3.connect(self.db_path) as conn:
+        if batch and sqlite3.sqlite_version_info >= self.UPSERT_MIN_SQLITE:
+            recorded_count = self._record_opened_links_batch(links, newsletter_hash, today, now)
+        else:
+            recorded_count = None
+        
+        if recorded_count is not None:
+            self.logger.info(f"Recorded {recorded_count} successfully opened links in database")
+            if aged_count > 0:
+                self.logger.info(f"Auto-blacklisted {aged_count} old links during cleanup")
+            
+            return {
+                'recorded_count': recorded_count,
+                'auto_blacklisted_aged': aged_count
+            }
+        
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
             # Create newsletter run record
@@ -523,8 +715,6 @@ class LinkManager:
                     self.logger.error(f"Error recording opened link {url}: {e}")
                     continue
             
-            conn.commit()
-            
             self.logger.info(f"Recorded {recorded_count} successfully opened links in database")
             if aged_count > 0:
                 self.logger.info(f"Auto-blacklisted {aged_count} old links during cleanup")
@@ -534,6 +724,54 @@ class LinkManager:
                 'auto_blacklisted_aged': aged_count
             }
     
+    def _record_opened_links_batch(self, links: List[str], newsletter_hash: Optional[str],
+                                   today: date, now: datetime) -> Optional[int]:
+        """
+        Record opened links with one transaction and executemany upserts.
+        
+        Links that can't be parsed are logged and skipped. Returns None if
+        the batch fails, so the caller can retry row by row rather than
+        leave every link unrecorded.
+        """
+        rows = [
+            (position, (url, self._extract_domain(url), today, today, url_hash))
+            for position, url, url_hash in self._hash_links(links, "recording opened")
+        ]
+        
+        try:
+            with self._transaction() as conn:
+                # Create newsletter run record
+                cursor = conn.execute("""
+                    INSERT INTO newsletter_runs 
+                    (run_date, run_time, newsletter_hash, links_found, opened_links, success)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (today, now, newsletter_hash, len(links), len(links), True))
+                
+                run_id = cursor.lastrowid
+                
+                # Insert new links or bump last_seen/seen_count on existing ones
+                conn.executemany("""
+                    INSERT INTO links 
+                    (url, domain, first_seen, last_seen, url_hash)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(url_hash) DO UPDATE
+                    SET last_seen = excluded.last_seen, seen_count = seen_count + 1
+                """, [row for _, row in rows])
+                
+                # Record link appearances in this run
+                conn.executemany("""
+                    INSERT OR IGNORE INTO link_appearances
+                    (link_id, run_id, position)
+                    SELECT id, ?, ? FROM links WHERE url_hash = ?
+                """, [(run_id, position, row[4]) for position, row in rows])
+        
+        except sqlite3.Error as e:
+            self.logger.warning(f"Batch recording of {len(links)} opened links failed ({e}), "
+                                f"retrying row by row")
+            return None
+        
+        return len(rows)
+    
     def blacklist_url(self, url: str, reason: str = "read") -> bool:
         """
         Add a URL to the blacklist.
@@ -548,7 +786,7 @@ class LinkManager:
         url_hash = self._hash_url(url)
         today = date.today()
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -568,7 +806,7 @@ class LinkManager:
         """Remove a URL from the blacklist."""
         url_hash = self._hash_url(url)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -586,9 +824,7 @@ class LinkManager:
     
     def get_reading_statistics(self) -> Dict:
         """Get comprehensive reading statistics."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
+        with self._reading() as cursor:
             # Basic counts
             cursor.execute("SELECT COUNT(*) FROM links")
             total_links = cursor.fetchone()[0]
@@ -640,9 +876,7 @@ class LinkManager:
     def export_data(self, export_path: Path, format: str = 'json') -> bool:
         """Export link data to file."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
+            with self._reading() as cursor:
                 # Get all links with metadata
                 cursor.execute("""
                     SELECT url, title, domain, first_seen, last_seen, 
@@ -686,7 +920,7 @@ class LinkManager:
         """Remove old data beyond specified days."""
         cutoff_date = date.today().replace(day=1)  # Keep at least current month
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
             # Remove old newsletter runs
@@ -696,7 +930,6 @@ class LinkManager:
             """.format(days_to_keep))
             
             removed_count = cursor.rowcount
-            conn.commit()
             
             self.logger.info(f"Cleaned up {removed_count} old records")
             return removed_count
@@ -749,5 +982,6 @@ if __name__ == "__main__":
         print(f"  {key}: {value}")
     
     # Cleanup
+    lm.close()
     test_db_path.unlink()
     print(f"\\nTest completed successfully!")
\ No newline at end of file
@@ -10,12 +10,17 @@ This addresses the user's concern about over-blacklisting.
 """
 
 import sys
-import tempfile
-import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
 from link_manager import LinkManager
 import logging
 
+# Stored links and successful runs, fetched in one step
+COUNTS_SQL = """
+    SELECT (SELECT COUNT(*) FROM links),
+           (SELECT COUNT(*) FROM newsletter_runs WHERE success = TRUE)
+"""
+
 def setup_test_logger():
     """Setup a logger for testing."""
     logger = logging.getLogger("test_blacklist")
@@ -30,209 +35,250 @@ def setup_test_logger():
     
     return logger
 
-def test_analyze_vs_record_behavior():
+TEST_LOGGER = setup_test_logger()
+
+class TestConfig:
+    """Shared test configuration."""
+    RECENT_LINK_DAYS = 0  # Block same-day re-opening
+    SQLITE_PRAGMAS = ()   # In-memory DB: no journal or fsync to tune
+
+@contextmanager
+def _make_link_manager():
+    """Create one in-memory database and LinkManager (schema bootstrapped once)."""
+    link_manager = LinkManager(":memory:", config=TestConfig, logger=TEST_LOGGER)
+    try:
+        yield link_manager
+    finally:
+        link_manager.close()
+
+def _database_files_leaked():
+    """Check that the in-memory test databases never created files on disk."""
+    return Path(":memory:").exists() or any(Path(".").glob("*.db-wal"))
+
+def _reset_database(link_manager):
+    """Empty all tables so the next test starts from a clean database."""
+    with link_manager._connect() as conn:
+        conn.execute("DELETE FROM link_appearances")
+        conn.execute("DELETE FROM links")
+        conn.execute("DELETE FROM newsletter_runs")
+
+def test_analyze_vs_record_behavior(link_manager=None):
     """Test that analyze doesn't store links, but record does."""
+    # Create in-memory database unless the suite passes in its shared one
+    if link_manager is None:
+        with _make_link_manager() as link_manager:
+            return test_analyze_vs_record_behavior(link_manager)
+    
     print("🧪 Testing Analyze vs Record Behavior")
     print("=" * 50)
     
-    # Create temporary database
-    with tempfile.TemporaryDirectory() as temp_dir:
-        db_path = Path(temp_dir) / "test.db"
-        logger = setup_test_logger()
-        
-        # Create a simple config object with recent link days = 0 (same day blocking)
-        class TestConfig:
-            RECENT_LINK_DAYS = 0  # Block same-day re-opening
-            
-        # Create LinkManager
-        link_manager = LinkManager(db_path, config=TestConfig, logger=logger)
-        
-        # Test links
-        test_links = [
-            "https://example.com/article1",
-            "https://example.com/article2", 
-            "https://example.com/article3"
-        ]
-        
-        print(f"\n📋 Test Links: {len(test_links)}")
-        for i, link in enumerate(test_links, 1):
-            print(f"  {i}. {link}")
-        
-        # Step 1: Analyze links (should NOT store in database)
-        print(f"\n🔍 Step 1: Analyzing links (should NOT store in database)")
-        analysis = link_manager.analyze_newsletter_links(test_links)
-        
-        print(f"   Analysis result: {len(analysis['links_to_open'])} links to open")
-        
-        # Check database - should be empty
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM links")
-            link_count = cursor.fetchone()[0]
-            cursor.execute("SELECT COUNT(*) FROM newsletter_runs")
-            run_count = cursor.fetchone()[0]
-        
-        print(f"   Database state after analysis:")
-        print(f"     Links stored: {link_count}")
-        print(f"     Runs recorded: {run_count}")
-        
-        if link_count == 0 and run_count == 0:
-            print("   ✅ CORRECT: Analysis did not store anything in database")
-        else:
-            print("   ❌ ERROR: Analysis should not store data in database")
-            return False
-        
-        # Step 2: Simulate opening only 2 of the 3 links
-        opened_links = test_links[:2]  # Only first 2 links
-        print(f"\n📂 Step 2: Recording {len(opened_links)} actually opened links")
-        for i, link in enumerate(opened_links, 1):
-            print(f"   {i}. {link}")
-        
-        record_result = link_manager.record_opened_links(opened_links, "test_newsletter")
-        print(f"   Recorded: {record_result['recorded_count']} links")
-        
-        # Check database - should contain only opened links
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM links")
-            link_count = cursor.fetchone()[0]
-            cursor.execute("SELECT url FROM links")
-            stored_urls = [row[0] for row in cursor.fetchall()]
-            cursor.execute("SELECT COUNT(*) FROM newsletter_runs WHERE success = TRUE")
-            run_count = cursor.fetchone()[0]
-        
-        print(f"   Database state after recording:")
-        print(f"     Links stored: {link_count}")
-        print(f"     Runs recorded: {run_count}")
-        print(f"     Stored URLs:")
-        for i, url in enumerate(stored_urls, 1):
-            print(f"       {i}. {url}")
-        
-        # Verify correct behavior
-        success = True
-        if link_count != 2:
-            print(f"   ❌ ERROR: Expected 2 stored links, got {link_count}")
-            success = False
-        
-        if run_count != 1:
-            print(f"   ❌ ERROR: Expected 1 run record, got {run_count}")
-            success = False
-            
-        if set(stored_urls) != set(opened_links):
-            print(f"   ❌ ERROR: Stored URLs don't match opened links")
-            success = False
-        
-        if success:
-            print("   ✅ CORRECT: Only actually opened links were stored")
-        
-        # Step 3: Test subsequent analysis
-        print(f"\n🔍 Step 3: Re-analyzing same links")
-        analysis2 = link_manager.analyze_newsletter_links(test_links)
-        
-        print(f"   Second analysis:")
-        print(f"     New links: {len(analysis2['new_links'])}")
-        print(f"     Existing links: {len(analysis2['existing_links'])}")
-        print(f"     Links to open: {len(analysis2['links_to_open'])}")
-        
-        # Should show: 0 existing (recently opened links are blocked), 1 new (never opened), 2 blacklisted (recently opened)
-        expected_existing = 0  # Recently opened links are blocked, not marked as "existing"
-        expected_new = 1       # The 1 we never opened
-        expected_blacklisted = 2  # The 2 we opened today (blocked from re-opening)
-        
-        if (len(analysis2['existing_links']) == expected_existing and 
-            len(analysis2['new_links']) == expected_new and
-            len(analysis2['blacklisted_links']) == expected_blacklisted):
-            print("   ✅ CORRECT: Recently opened links blocked from re-opening, new link available")
-        else:
-            print(f"   ❌ ERROR: Expected {expected_existing} existing, {expected_new} new, {expected_blacklisted} blacklisted")
-            success = False
+    # Test links
+    test_links = [
+        "https://example.com/article1",
+        "https://example.com/article2", 
+        "https://example.com/article3"
+    ]
+    
+    print(f"\n📋 Test Links: {len(test_links)}")
+    for i, link in enumerate(test_links, 1):
+        print(f"  {i}. {link}")
+    
+    # Step 1: Analyze links (should NOT store in database)
+    print(f"\n🔍 Step 1: Analyzing links (should NOT store in database)")
+    analysis = link_manager.analyze_newsletter_links(test_links)
+    
+    print(f"   Analysis result: {len(analysis['links_to_open'])} links to open")
+    
+    # Check database - should be empty
+    conn = link_manager._connect()
+    link_count, run_count = conn.execute(COUNTS_SQL).fetchone()
+    
+    print(f"   Database state after analysis:")
+    print(f"     Links stored: {link_count}")
+    print(f"     Runs recorded: {run_count}")
+    
+    if link_count == 0 and run_count == 0:
+        print("   ✅ CORRECT: Analysis did not store anything in database")
+    else:
+        print("   ❌ ERROR: Analysis should not store data in database")
+        return False
+    
+    # Step 2: Simulate opening only 2 of the 3 links
+    opened_links = test_links[:2]  # Only first 2 links
+    print(f"\n📂 Step 2: Recording {len(opened_links)} actually opened links")
+    for i, link in enumerate(opened_links, 1):
+        print(f"   {i}. {link}")
+    
+    record_result = link_manager.record_opened_links(opened_links, "test_newsletter")
+    print(f"   Recorded: {record_result['recorded_count']} links")
+    
+    # Check database - should contain only opened links
+    link_count, run_count = conn.execute(COUNTS_SQL).fetchone()
+    stored_urls = [row[0] for row in conn.execute("SELECT url FROM links")]
+    
+    print(f"   Database state after recording:")
+    print(f"     Links stored: {link_count}")
+    print(f"     Runs recorded: {run_count}")
+    print(f"     Stored URLs:")
+    for i, url in enumerate(stored_urls, 1):
+        print(f"       {i}. {url}")
+    
+    # Verify correct behavior
+    success = True
+    if link_count != 2:
+        print(f"   ❌ ERROR: Expected 2 stored links, got {link_count}")
+        success = False
+    
+    if run_count != 1:
+        print(f"   ❌ ERROR: Expected 1 run record, got {run_count}")
+        success = False
         
-        return success
+    if sorted(stored_urls) != sorted(opened_links):
+        print(f"   ❌ ERROR: Stored URLs don't match opened links")
+        success = False
+    
+    if success:
+        print("   ✅ CORRECT: Only actually opened links were stored")
+    
+    # Step 3: Test subsequent analysis
+    print(f"\n🔍 Step 3: Re-analyzing same links")
+    analysis2 = link_manager.analyze_newsletter_links(test_links)
+    
+    print(f"   Second analysis:")
+    print(f"     New links: {len(analysis2['new_links'])}")
+    print(f"     Existing links: {len(analysis2['existing_links'])}")
+    print(f"     Links to open: {len(analysis2['links_to_open'])}")
+    
+    # Should show: 0 existing (recently opened links are blocked), 1 new (never opened), 2 blacklisted (recently opened)
+    expected_existing = 0  # Recently opened links are blocked, not marked as "existing"
+    expected_new = 1       # The 1 we never opened
+    expected_blacklisted = 2  # The 2 we opened today (blocked from re-opening)
+    
+    if (len(analysis2['existing_links']) == expected_existing and 
+        len(analysis2['new_links']) == expected_new and
+        len(analysis2['blacklisted_links']) == expected_blacklisted):
+        print("   ✅ CORRECT: Recently opened links blocked from re-opening, new link available")
+    else:
+        print(f"   ❌ ERROR: Expected {expected_existing} existing, {expected_new} new, {expected_blacklisted} blacklisted")
+        success = False
+    
+    return success
+
+def test_malformed_links(link_manager=None):
+    """A link that can't be parsed is skipped without failing the others."""
+    if link_manager is None:
+        with _make_link_manager() as link_manager:
+            return test_malformed_links(link_manager)
+    
+    print(f"\n🧩 Testing Malformed Links")
+    print("=" * 50)
+    
+    links = [
+        "https://example.com/good-1",
+        "http://[bad/x",  # urlparse: Invalid IPv6 URL
+        "https://example.com/good-2"
+    ]
+    
+    analysis = link_manager.analyze_newsletter_links(links)
+    if analysis['links_to_open'] != [links[0], links[2]]:
+        print(f"   ❌ ERROR: Expected the two valid links to open, got {analysis['links_to_open']}")
+        return False
+    print("   ✅ Analysis skipped the malformed link and kept the valid ones")
+    
+    record_result = link_manager.record_opened_links(links, "malformed_test")
+    link_count, _ = link_manager._connect().execute(COUNTS_SQL).fetchone()
+    if record_result['recorded_count'] != 2 or link_count != 2:
+        print(f"   ❌ ERROR: Expected 2 links recorded, got {record_result['recorded_count']} "
+              f"({link_count} stored)")
+        return False
+    print("   ✅ Recording skipped the malformed link and stored the valid ones")
+    
+    return True
 
-def test_testing_vs_production_workflow():
+def test_testing_vs_production_workflow(link_manager=None):
     """Test the difference between testing and production workflows."""
+    if link_manager is None:
+        with _make_link_manager() as link_manager:
+            return test_testing_vs_production_workflow(link_manager)
+    
+    # Run every scenario inside one transaction that is rolled back at the
+    # end; LinkManager's own writes nest in savepoints, so nothing the
+    # workflow records is ever committed
+    conn = link_manager._connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        return _run_workflow_scenarios(link_manager, conn)
+    finally:
+        conn.rollback()
+
+def _run_workflow_scenarios(link_manager, conn):
+    """Manual test run, morning run and same-day re-analysis on one database."""
     print(f"\n🔬 Testing vs Production Workflow Comparison")
     print("=" * 50)
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        db_path = Path(temp_dir) / "workflow_test.db"
-        logger = setup_test_logger()
-        
-        # Create a simple config object with recent link days = 0 (same day blocking)
-        class TestConfig:
-            RECENT_LINK_DAYS = 0  # Block same-day re-opening
-            
-        link_manager = LinkManager(db_path, config=TestConfig, logger=logger)
-        
-        test_links = [
-            "https://example.com/morning-news-1",
-            "https://example.com/morning-news-2",
-            "https://example.com/morning-news-3"
-        ]
-        
-        # Scenario 1: User runs manual test (analyze only)
-        print("\n📋 Scenario 1: Manual Test Run (User testing installation)")
-        print("   User runs: neuron-automation (just to test)")
-        print("   Expected: Links analyzed but NOT stored in database")
-        
-        analysis = link_manager.analyze_newsletter_links(test_links)
-        print(f"   Links that would be opened: {len(analysis['links_to_open'])}")
-        
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM links")
-            link_count = cursor.fetchone()[0]
-        
-        print(f"   Database links after test: {link_count}")
-        
-        if link_count == 0:
-            print("   ✅ CORRECT: Test run did not pollute database")
-        else:
-            print("   ❌ ERROR: Test run should not store links")
-            return False
-        
-        # Scenario 2: Automated morning run (analyze + record)
-        print("\n🌅 Scenario 2: Morning Automation Run")
-        print("   System runs: automation opens tabs successfully")
-        print("   Expected: Links stored in database (were actually opened)")
-        
-        # Simulate successful tab opening
-        opened_links = test_links  # All tabs opened successfully
-        record_result = link_manager.record_opened_links(opened_links, "morning_newsletter")
-        
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM links")
-            link_count = cursor.fetchone()[0]
-        
-        print(f"   Database links after morning run: {link_count}")
-        print(f"   Successfully recorded: {record_result['recorded_count']} links")
-        
-        if link_count == len(test_links):
-            print("   ✅ CORRECT: Morning run properly stored opened links")
-        else:
-            print("   ❌ ERROR: Morning run should store all opened links")
-            return False
-        
-        # Scenario 3: Next day analysis  
-        print("\n📅 Scenario 3: Same Day Re-Analysis")
-        print("   Same newsletter links encountered again")
-        print("   Expected: All links marked as 'blacklisted' (recently opened), none to open")
-        
-        next_analysis = link_manager.analyze_newsletter_links(test_links)
-        print(f"   New links: {len(next_analysis['new_links'])}")
-        print(f"   Existing links: {len(next_analysis['existing_links'])}")
-        print(f"   Blacklisted links: {len(next_analysis['blacklisted_links'])}")
-        print(f"   Links to open: {len(next_analysis['links_to_open'])}")
-        
-        if (len(next_analysis['blacklisted_links']) == len(test_links) and 
-            len(next_analysis['links_to_open']) == 0):
-            print("   ✅ CORRECT: Recently opened links blocked from re-opening")
-        else:
-            print("   ❌ ERROR: Recently opened links should be blocked")
-            return False
-        
-        return True
+    test_links = [
+        "https://example.com/morning-news-1",
+        "https://example.com/morning-news-2",
+        "https://example.com/morning-news-3"
+    ]
+    
+    # Scenario 1: User runs manual test (analyze only)
+    print("\n📋 Scenario 1: Manual Test Run (User testing installation)")
+    print("   User runs: neuron-automation (just to test)")
+    print("   Expected: Links analyzed but NOT stored in database")
+    
+    analysis = link_manager.analyze_newsletter_links(test_links)
+    print(f"   Links that would be opened: {len(analysis['links_to_open'])}")
+    
+    link_count, run_count = conn.execute(COUNTS_SQL).fetchone()
+    
+    print(f"   Database links after test: {link_count}")
+    
+    if link_count == 0 and run_count == 0:
+        print("   ✅ CORRECT: Test run did not pollute database")
+    else:
+        print("   ❌ ERROR: Test run should not store links")
+        return False
+    
+    # Scenario 2: Automated morning run (analyze + record)
+    print("\n🌅 Scenario 2: Morning Automation Run")
+    print("   System runs: automation opens tabs successfully")
+    print("   Expected: Links stored in database (were actually opened)")
+    
+    # Simulate successful tab opening
+    opened_links = test_links  # All tabs opened successfully
+    record_result = link_manager.record_opened_links(opened_links, "morning_newsletter")
+    
+    link_count, run_count = conn.execute(COUNTS_SQL).fetchone()
+    
+    print(f"   Database links after morning run: {link_count}")
+    print(f"   Successfully recorded: {record_result['recorded_count']} links")
+    
+    if link_count == len(test_links) and run_count == 1:
+        print("   ✅ CORRECT: Morning run properly stored opened links")
+    else:
+        print("   ❌ ERROR: Morning run should store all opened links")
+        return False
+    
+    # Scenario 3: Next day analysis  
+    print("\n📅 Scenario 3: Same Day Re-Analysis")
+    print("   Same newsletter links encountered again")
+    print("   Expected: All links marked as 'blacklisted' (recently opened), none to open")
+    
+    next_analysis = link_manager.analyze_newsletter_links(test_links)
+    print(f"   New links: {len(next_analysis['new_links'])}")
+    print(f"   Existing links: {len(next_analysis['existing_links'])}")
+    print(f"   Blacklisted links: {len(next_analysis['blacklisted_links'])}")
+    print(f"   Links to open: {len(next_analysis['links_to_open'])}")
+    
+    if (len(next_analysis['blacklisted_links']) == len(test_links) and 
+        len(next_analysis['links_to_open']) == 0):
+        print("   ✅ CORRECT: Recently opened links blocked from re-opening")
+    else:
+        print("   ❌ ERROR: Recently opened links should be blocked")
+        return False
+    
+    return True
 
 def main():
     """Run all blacklist behavior tests."""
@@ -242,17 +288,24 @@ def main():
     
     tests = [
         ("Analyze vs Record Behavior", test_analyze_vs_record_behavior),
-        ("Testing vs Production Workflow", test_testing_vs_production_workflow)
+        ("Testing vs Production Workflow", test_testing_vs_production_workflow),
+        ("Malformed Links", test_malformed_links)
     ]
     
     results = []
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ {test_name} failed with error: {e}")
-            results.append((test_name, False))
+    with _make_link_manager() as link_manager:
+        for test_name, test_func in tests:
+            _reset_database(link_manager)
+            try:
+                result = test_func(link_manager)
+                results.append((test_name, result))
+            except Exception as e:
+                print(f"❌ {test_name} failed with error: {e}")
+                results.append((test_name, False))
+    
+    if _database_files_leaked():
+        print("❌ In-memory test database leaked files to disk")
+        results.append(("In-Memory Database Isolation", False))
     
     # Summary
     print("\n" + "=" * 70)
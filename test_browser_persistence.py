@@ -7,39 +7,43 @@ Simple test to verify that Chrome browser stays open after the script ends.
 This simulates the automation workflow to ensure tabs remain accessible.
 """
 
+import os
 import time
 import sys
 import tempfile
 from pathlib import Path
+from types import MappingProxyType
+
+# Chrome options that should keep the browser open (immutable, shared)
+_PERSISTENCE_ARGS = (
+    '--disable-extensions-except',
+    '--disable-extensions',
+    '--no-first-run',
+    '--disable-default-apps',
+    '--disable-blink-features=AutomationControlled'
+)
+
+_EXPERIMENTAL_OPTS = MappingProxyType({
+    "detach": True,
+    "useAutomationExtension": False,
+    "excludeSwitches": ("enable-automation", "enable-logging")
+})
+
 
 def test_chrome_persistence_logic():
     """Test the browser persistence configuration without Selenium."""
     print("🧪 Testing Chrome Persistence Configuration...")
     
-    # Test the Chrome options that should keep browser open
-    persistence_options = [
-        '--disable-extensions-except',
-        '--disable-extensions', 
-        '--no-first-run',
-        '--disable-default-apps',
-        '--disable-blink-features=AutomationControlled'
-    ]
+    lines = ["  ✅ Chrome arguments for persistence:"]
+    lines.extend(f"    {option}" for option in _PERSISTENCE_ARGS)
     
-    experimental_options = {
-        "detach": True,
-        "useAutomationExtension": False,
-        "excludeSwitches": ["enable-automation", "enable-logging"]
-    }
+    lines.append("  ✅ Experimental options:")
+    # Shown as lists, the form Chrome options take them in
+    lines.extend(f"    {key}: {list(value) if isinstance(value, tuple) else value}"
+                 for key, value in _EXPERIMENTAL_OPTS.items())
     
-    print("  ✅ Chrome arguments for persistence:")
-    for option in persistence_options:
-        print(f"    {option}")
-    
-    print("  ✅ Experimental options:")
-    for key, value in experimental_options.items():
-        print(f"    {key}: {value}")
-    
-    print("  ✅ Key setting: detach=True (prevents browser close)")
+    lines.append("  ✅ Key setting: detach=True (prevents browser close)")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return True
 
@@ -60,9 +64,12 @@ def test_workflow_simulation():
         "8. Script ends - Browser persists"
     ]
     
-    for step in steps:
-        print(f"  ✅ {step}")
-        time.sleep(0.1)  # Brief pause for demo
+    if os.environ.get('NEURON_DEMO'):
+        for step in steps:
+            print(f"  ✅ {step}")
+            time.sleep(0.1)  # Brief pause for demo
+    else:
+        sys.stdout.write("".join(f"  ✅ {step}\n" for step in steps))
     
     print("\n  🎯 Critical: Browser detaches and remains open!")
     return True
@@ -7,13 +7,83 @@ Test script to verify that the pip installation setup would work correctly.
 This validates the setup.py configuration and package structure.
 """
 
+import ast
+import functools
+import re
 import sys
-import subprocess
 import tempfile
 import os
 from pathlib import Path
 import shutil
 
+@functools.lru_cache(maxsize=None)
+def _dir_entries(path='.'):
+    """Names in a directory, read with one scandir pass and cached for membership checks."""
+    with os.scandir(path) as it:
+        return frozenset(entry.name for entry in it)
+
+@functools.lru_cache(maxsize=1)
+def _setup_src():
+    """Contents of setup.py, read from disk once."""
+    return Path('setup.py').read_text()
+
+@functools.lru_cache(maxsize=1)
+def _parse_setup_kwargs():
+    """
+    Statically extract the literal keyword arguments of the setup() call.
+    
+    Keywords that reference a module-level name (e.g. ``install_requires=install_requires``)
+    are resolved to that name's literal value. setup.py is never executed.
+    """
+    tree = ast.parse(_setup_src(), filename='setup.py')
+    
+    # Module-level literal assignments such as install_requires = [...]
+    literals = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            try:
+                literals[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                continue
+    
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and getattr(node.func, 'id', None) == 'setup':
+            kwargs = {}
+            for kw in node.keywords:
+                if isinstance(kw.value, ast.Name):
+                    if kw.value.id in literals:
+                        kwargs[kw.arg] = literals[kw.value.id]
+                    continue
+                try:
+                    kwargs[kw.arg] = ast.literal_eval(kw.value)
+                except ValueError:
+                    continue
+            return kwargs
+    
+    return {}
+
+def _in_build_isolation():
+    """True when running inside a PEP 517 build backend (e.g. pip's isolated build)."""
+    return bool(os.environ.get('PEP517_BUILD_BACKEND') or
+                os.environ.get('_PYPROJECT_HOOKS_BUILD_BACKEND'))
+
+def load_distribution():
+    """Run setup.py in-process up to the config stage and return the Distribution."""
+    import setuptools  # noqa: F401 - provides distutils on Python 3.12+
+    
+    if _in_build_isolation():
+        # Don't re-enter setup.py from inside a build backend; build the
+        # Distribution from the statically parsed setup() arguments instead
+        from setuptools.dist import Distribution
+        
+        dist = Distribution(dict(_parse_setup_kwargs()))
+        dist.parse_config_files()
+        return dist
+    
+    from distutils.core import run_setup
+    
+    return run_setup('setup.py', stop_after='config')
+
 def test_setup_py_validation():
     """Test that setup.py is valid and can be processed."""
     print("🔍 Testing setup.py validation")
@@ -21,27 +91,25 @@ def test_setup_py_validation():
     
     try:
         # Test setup.py syntax
-        result = subprocess.run([
-            sys.executable, 'setup.py', 'check'
-        ], capture_output=True, text=True, cwd=Path.cwd())
-        
-        if result.returncode == 0:
-            print("✅ setup.py syntax is valid")
-        else:
+        try:
+            dist = load_distribution()
+            dist.run_command('check')
+        except Exception as e:
             print("❌ setup.py has syntax errors:")
-            print(result.stderr)
+            print(e)
             return False
         
+        print("✅ setup.py syntax is valid")
+        
         # Test that we can generate package metadata
-        result = subprocess.run([
-            sys.executable, 'setup.py', '--name', '--version', '--description'
-        ], capture_output=True, text=True, cwd=Path.cwd())
+        name = dist.metadata.get_name()
+        version = dist.metadata.get_version()
+        description = dist.metadata.get_description()
         
-        if result.returncode == 0:
-            lines = result.stdout.strip().split('\n')
-            print(f"   Package name: {lines[0]}")
-            print(f"   Version: {lines[1]}")
-            print(f"   Description: {lines[2]}")
+        if name and version and description:
+            print(f"   Package name: {name}")
+            print(f"   Version: {version}")
+            print(f"   Description: {description}")
             print("✅ Package metadata generation works")
         else:
             print("❌ Cannot generate package metadata")
@@ -71,7 +139,7 @@ def test_required_modules():
         try:
             # Test if module file exists
             module_file = Path(f"{module_name}.py")
-            if not module_file.exists():
+            if module_file.name not in _dir_entries():
                 print(f"❌ Module file missing: {module_file}")
                 continue
             
@@ -90,9 +158,8 @@ def test_entry_points():
     print("=" * 50)
     
     try:
-        # Read setup.py and check entry points
-        with open('setup.py', 'r') as f:
-            setup_content = f.read()
+        # Parse setup.py and check entry points
+        console_scripts = _parse_setup_kwargs().get('entry_points', {}).get('console_scripts', [])
         
         # Check for expected entry points
         expected_entries = [
@@ -102,7 +169,7 @@ def test_entry_points():
         
         found_entries = 0
         for entry in expected_entries:
-            if entry in setup_content:
+            if entry in console_scripts:
                 print(f"✅ Found entry point: {entry}")
                 found_entries += 1
             else:
@@ -134,18 +201,17 @@ def test_package_files():
     found_count = 0
     
     for file_path in required_files:
-        path = Path(file_path)
-        if path.exists():
+        if file_path in _dir_entries():
             print(f"✅ Found required file: {file_path}")
             found_count += 1
         else:
             print(f"❌ Missing required file: {file_path}")
     
     # Check installer directory
-    installers_dir = Path('installers')
-    if installers_dir.exists():
-        installer_files = list(installers_dir.glob('install_*'))
-        print(f"✅ Found installer directory with {len(installer_files)} files")
+    if 'installers' in _dir_entries():
+        installer_count = sum(1 for name in _dir_entries('installers')
+                              if name.startswith('install_'))
+        print(f"✅ Found installer directory with {installer_count} files")
         found_count += 1
     else:
         print("❌ Missing installers directory")
@@ -163,20 +229,19 @@ def test_dependencies():
         with open('requirements.txt', 'r') as f:
             requirements = f.read().strip().split('\n')
         
-        print("📋 requirements.txt dependencies:")
-        for req in requirements:
-            if req.strip():
-                print(f"   • {req}")
+        lines = ["📋 requirements.txt dependencies:"]
+        lines.extend(f"   • {req}" for req in requirements if req.strip())
+        sys.stdout.write("\n".join(lines) + "\n")
         
         # Check setup.py dependencies
-        with open('setup.py', 'r') as f:
-            setup_content = f.read()
+        install_requires = _parse_setup_kwargs().get('install_requires', [])
+        declared_deps = {re.split(r'[<>=!~;\[ ]', req, maxsplit=1)[0] for req in install_requires}
         
         expected_deps = ['selenium', 'webdriver-manager', 'requests', 'beautifulsoup4']
         found_deps = 0
         
         for dep in expected_deps:
-            if dep in setup_content:
+            if dep in declared_deps:
                 found_deps += 1
         
         print(f"\n✅ Found {found_deps}/{len(expected_deps)} expected dependencies in setup.py")
@@ -195,16 +260,17 @@ def test_build_simulation():
     try:
         # Test sdist build (source distribution)
         print("Testing source distribution build...")
-        result = subprocess.run([
-            sys.executable, 'setup.py', 'sdist', '--dry-run'
-        ], capture_output=True, text=True, cwd=Path.cwd())
-        
-        if result.returncode == 0:
-            print("✅ Source distribution build simulation successful")
-        else:
+        try:
+            dist = load_distribution()
+            dist.dry_run = True
+            dist.get_command_obj('sdist').dry_run = True
+            dist.run_command('sdist')
+        except Exception as e:
             print("❌ Source distribution build simulation failed:")
-            print(result.stderr)
+            print(e)
             return False
+        
+        print("✅ Source distribution build simulation successful")
             
         return True
         
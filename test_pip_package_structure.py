@@ -10,7 +10,73 @@ without requiring setuptools to be installed.
 import sys
 from pathlib import Path
 import ast
+import functools
+import io
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+@functools.lru_cache(maxsize=None)
+def _read(path):
+    """Read a source file once per run; every test reuses the contents."""
+    return Path(path).read_text(encoding='utf-8')
+
+@functools.lru_cache(maxsize=None)
+def _ast(path):
+    """Parse a source file once per run."""
+    return ast.parse(_read(path), filename=path)
+
+@functools.lru_cache(maxsize=None)
+def _definitions(path):
+    """Names of all functions and classes, plus module-level assignments."""
+    tree = _ast(path)
+    names = {node.name for node in ast.walk(tree)
+             if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))}
+    names.update(target.id for node in tree.body if isinstance(node, ast.Assign)
+                 for target in node.targets if isinstance(target, ast.Name))
+    return frozenset(names)
+
+# Version declarations in setup.py and neuron_automation.py
+_SETUP_VER = re.compile(r'version="([^"]+)"')
+_MAIN_VER = re.compile(r'__version__ = "([^"]+)"')
+
+# CLI options the help and workflow tests expect neuron_automation.py to define
+_KEY_CMDS = frozenset({'--setup', '--rewind', '--stats', '--blacklist'})
+_WORKFLOW_CMDS = frozenset({'--setup', '--stats', '--rewind'})
+
+@functools.lru_cache(maxsize=None)
+def _token_pattern(tokens):
+    """
+    Compile one multi-token matcher for a set of literal tokens.
+    
+    The alternation is wrapped in a lookahead so a match can start at
+    every position, and longer tokens are tried first; a shorter token that
+    is a prefix of the match (e.g. '--rewind' in '--rewind-preview') is
+    credited by _scan_tokens.
+    """
+    ordered = sorted(tokens, key=len, reverse=True)
+    return re.compile('(?=(%s))' % '|'.join(map(re.escape, ordered)))
+
+@functools.lru_cache(maxsize=None)
+def _scan_tokens(path, *tokens):
+    """
+    Return which of the given literal tokens appear in a source file.
+    
+    The file is streamed line by line, every token is matched in a single
+    pass per line, and the scan stops as soon as all have been seen.
+    """
+    pattern = _token_pattern(frozenset(tokens))
+    needed = set(tokens)
+    found = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            for match in pattern.findall(line):
+                hits = {token for token in needed if match.startswith(token)}
+                found |= hits
+                needed -= hits
+            if not needed:
+                break
+    return frozenset(found)
 
 def test_main_functions_exist():
     """Test that main functions exist in the modules."""
@@ -19,20 +85,16 @@ def test_main_functions_exist():
     
     # Test neuron_automation.py has main()
     try:
-        with open('neuron_automation.py', 'r') as f:
-            content = f.read()
-        
-        if 'def main():' in content and '__name__ == "__main__"' in content:
+        if ('main' in _definitions('neuron_automation.py')
+                and _scan_tokens('neuron_automation.py', '__name__ == "__main__"')):
             print("✅ neuron_automation.py has proper main() function")
         else:
             print("❌ neuron_automation.py missing main() function")
             return False
             
         # Test blacklist_rewind.py has main()
-        with open('blacklist_rewind.py', 'r') as f:
-            content = f.read()
-        
-        if 'def main():' in content and '__name__ == "__main__"' in content:
+        if ('main' in _definitions('blacklist_rewind.py')
+                and _scan_tokens('blacklist_rewind.py', '__name__ == "__main__"')):
             print("✅ blacklist_rewind.py has proper main() function")
         else:
             print("❌ blacklist_rewind.py missing main() function")
@@ -51,30 +113,23 @@ def test_import_structure():
     
     try:
         # Test that config can be imported
-        with open('config.py', 'r') as f:
-            config_content = f.read()
+        config_names = _definitions('config.py')
         
-        if 'class Config' in config_content or 'ACTIVE_CONFIG' in config_content:
+        if 'Config' in config_names or 'ACTIVE_CONFIG' in config_names:
             print("✅ config.py has proper configuration structure")
         else:
             print("❌ config.py missing configuration classes")
             return False
         
         # Test that link_manager imports are correct
-        with open('link_manager.py', 'r') as f:
-            link_content = f.read()
-        
-        if 'class LinkManager' in link_content:
+        if 'LinkManager' in _definitions('link_manager.py'):
             print("✅ link_manager.py has LinkManager class")
         else:
             print("❌ link_manager.py missing LinkManager class")
             return False
         
         # Test that blacklist_rewind imports are correct
-        with open('blacklist_rewind.py', 'r') as f:
-            rewind_content = f.read()
-        
-        if 'class BlacklistRewind' in rewind_content:
+        if 'BlacklistRewind' in _definitions('blacklist_rewind.py'):
             print("✅ blacklist_rewind.py has BlacklistRewind class")
         else:
             print("❌ blacklist_rewind.py missing BlacklistRewind class")
@@ -92,25 +147,25 @@ def test_setup_command():
     print("=" * 50)
     
     try:
-        with open('neuron_automation.py', 'r') as f:
-            content = f.read()
+        found = _scan_tokens('neuron_automation.py', '--setup', 'setup_system_integration',
+                             'urllib.request', 'githubusercontent.com')
         
         # Check for setup argument
-        if '--setup' in content and 'setup_system_integration' in content:
+        if {'--setup', 'setup_system_integration'} <= found:
             print("✅ --setup command is implemented")
         else:
             print("❌ --setup command not properly implemented")
             return False
         
         # Check that setup function exists
-        if 'def setup_system_integration():' in content:
+        if 'setup_system_integration' in _definitions('neuron_automation.py'):
             print("✅ setup_system_integration() function exists")
         else:
             print("❌ setup_system_integration() function missing")
             return False
         
         # Check that it downloads installer scripts
-        if 'urllib.request' in content and 'githubusercontent.com' in content:
+        if {'urllib.request', 'githubusercontent.com'} <= found:
             print("✅ Setup downloads installer scripts from GitHub")
         else:
             print("❌ Setup doesn't download installer scripts")
@@ -129,10 +184,9 @@ def test_version_consistency():
     
     try:
         # Get version from setup.py
-        with open('setup.py', 'r') as f:
-            setup_content = f.read()
+        setup_content = _read('setup.py')
         
-        setup_version_match = re.search(r'version="([^"]+)"', setup_content)
+        setup_version_match = _SETUP_VER.search(setup_content)
         if setup_version_match:
             setup_version = setup_version_match.group(1)
             print(f"   setup.py version: {setup_version}")
@@ -141,10 +195,9 @@ def test_version_consistency():
             return False
         
         # Get version from neuron_automation.py
-        with open('neuron_automation.py', 'r') as f:
-            main_content = f.read()
+        main_content = _read('neuron_automation.py')
         
-        main_version_match = re.search(r'__version__ = "([^"]+)"', main_content)
+        main_version_match = _MAIN_VER.search(main_content)
         if main_version_match:
             main_version = main_version_match.group(1)
             print(f"   neuron_automation.py version: {main_version}")
@@ -169,28 +222,24 @@ def test_command_line_help():
     print("=" * 50)
     
     try:
-        with open('neuron_automation.py', 'r') as f:
-            content = f.read()
-        
         # Check for ArgumentParser
-        if 'ArgumentParser' in content:
+        if _scan_tokens('neuron_automation.py', 'ArgumentParser'):
             print("✅ Uses ArgumentParser for command line")
         else:
             print("❌ No ArgumentParser found")
             return False
         
         # Check for key commands
-        key_commands = ['--setup', '--rewind', '--stats', '--blacklist']
-        found_commands = 0
+        found = _scan_tokens('neuron_automation.py', *_KEY_CMDS)
+        missing = _KEY_CMDS - found
         
-        for cmd in key_commands:
-            if cmd in content:
-                found_commands += 1
-                print(f"✅ Found command: {cmd}")
-            else:
+        for cmd in sorted(_KEY_CMDS):
+            if cmd in missing:
                 print(f"❌ Missing command: {cmd}")
+            else:
+                print(f"✅ Found command: {cmd}")
         
-        return found_commands >= 3  # At least 3 out of 4
+        return len(missing) <= 1  # At least 3 out of 4
         
     except Exception as e:
         print(f"❌ Error checking command line help: {e}")
@@ -214,20 +263,53 @@ def test_installation_workflow():
         print(f"   {i}. {command}")
         print(f"      → {description}")
     
-    # Check that all workflow commands are supported
-    with open('neuron_automation.py', 'r') as f:
-        content = f.read()
+    # Check that all workflow commands are supported; the scan stops at the
+    # line where the last of them is found instead of reading the whole file
+    found = _scan_tokens('neuron_automation.py', *_WORKFLOW_CMDS)
+    supported_commands = len(_WORKFLOW_CMDS & found)
+    
+    print(f"\n✅ Supports {supported_commands}/{len(_WORKFLOW_CMDS)} workflow commands")
+    
+    return found >= _WORKFLOW_CMDS
+
+class _ThreadLocalStdout:
+    """
+    sys.stdout stand-in that sends each thread's prints to its own buffer.
+    
+    contextlib.redirect_stdout swaps the process-wide sys.stdout, so it
+    cannot keep concurrently running tests from interleaving their output.
+    """
+    
+    def __init__(self, fallback):
+        self._fallback = fallback
+        self._local = threading.local()
     
-    supported_commands = 0
-    workflow_commands = ['--setup', '--stats', '--rewind']
+    @property
+    def _target(self):
+        buffer = getattr(self._local, 'buffer', None)
+        return self._fallback if buffer is None else buffer
     
-    for cmd in workflow_commands:
-        if cmd in content:
-            supported_commands += 1
+    def capture(self, buffer):
+        self._local.buffer = buffer
     
-    print(f"\n✅ Supports {supported_commands}/{len(workflow_commands)} workflow commands")
+    def write(self, text):
+        return self._target.write(text)
     
-    return supported_commands == len(workflow_commands)
+    def flush(self):
+        self._target.flush()
+
+def _run_captured(stdout, test_name, test_func):
+    """Run one test with its output captured; returns (result, output)."""
+    buffer = io.StringIO()
+    stdout.capture(buffer)
+    try:
+        result = test_func()
+    except Exception as e:
+        print(f"❌ {test_name} failed with error: {e}")
+        result = False
+    finally:
+        stdout.capture(None)
+    return result, buffer.getvalue()
 
 def main():
     """Run package structure tests."""
@@ -245,14 +327,23 @@ def main():
         ("Installation Workflow", test_installation_workflow)
     ]
     
+    # The tests are independent and I/O-bound, so run them concurrently and
+    # replay each one's output in the original order
+    original_stdout = sys.stdout
+    stdout = _ThreadLocalStdout(original_stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [(test_name, executor.submit(_run_captured, stdout, test_name, test_func))
+                       for test_name, test_func in tests]
+            outcomes = [(test_name, future.result()) for test_name, future in futures]
+    finally:
+        sys.stdout = original_stdout
+    
     results = []
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ {test_name} failed with error: {e}")
-            results.append((test_name, False))
+    for test_name, (result, output) in outcomes:
+        sys.stdout.write(output)
+        results.append((test_name, result))
     
     # Summary
     print("\n" + "=" * 70)
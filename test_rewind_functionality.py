@@ -8,13 +8,16 @@ Tests time-based restoration of blacklisted links.
 """
 
 import sys
+import io
+import json
+import contextlib
+import functools
 import tempfile
 import sqlite3
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from blacklist_rewind import BlacklistRewind
 from link_manager import LinkManager
-import json
 import logging
 
 def setup_test_logger():
@@ -30,6 +33,48 @@ def setup_test_logger():
     
     return logger
 
+# Shared-cache in-memory database used by every test; it lives as long as
+# the anchor connection returned by _fresh_db() stays open.
+TEST_DB_URI = "file:test_rewind?mode=memory&cache=shared"
+_db_anchor = None
+
+def _fresh_db() -> sqlite3.Connection:
+    """Return the anchor connection to the shared test database, emptied."""
+    global _db_anchor
+    if _db_anchor is None:
+        _db_anchor = sqlite3.connect(TEST_DB_URI, uri=True)
+    
+    with _db_anchor as conn:
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+        for table in tables:
+            conn.execute(f"DELETE FROM {table}")
+    
+    return _db_anchor
+
+# Blacklisted and available link counts in a single scan
+BLACKLIST_COUNTS_SQL = """
+    SELECT COALESCE(SUM(CASE WHEN is_blacklisted THEN 1 ELSE 0 END), 0),
+           COALESCE(SUM(CASE WHEN is_blacklisted THEN 0 ELSE 1 END), 0)
+    FROM links
+"""
+
+@functools.lru_cache(maxsize=None)
+def _preview_at(rewind_tool: BlacklistRewind, days: int, data_version: int) -> dict:
+    """Memoized preview_rewind; data_version makes any committed write a cache miss."""
+    return rewind_tool.preview_rewind(days)
+
+def _preview(rewind_tool: BlacklistRewind, days: int) -> dict:
+    """Preview a rewind, reusing the result while the test database is unchanged."""
+    data_version = _db_anchor.execute("PRAGMA data_version").fetchone()[0]
+    return _preview_at(rewind_tool, days, data_version)
+
+def _sql_literal(value) -> str:
+    """Render an int or str as an SQL literal for the test-data script."""
+    if isinstance(value, int):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
 def create_test_data(link_manager: LinkManager) -> None:
     """Create test data with blacklisted links from different dates."""
     
@@ -73,180 +118,199 @@ def create_test_data(link_manager: LinkManager) -> None:
     ]
     
     # Insert test data directly into database
-    with sqlite3.connect(link_manager.db_path) as conn:
-        cursor = conn.cursor()
-        
-        for scenario in test_scenarios:
-            blacklist_date = (date.today() - timedelta(days=scenario['days_ago'])).isoformat()
-            
-            for url in scenario['urls']:
-                url_hash = link_manager._hash_url(url)
-                domain = link_manager._extract_domain(url)
-                
-                # Insert link with blacklist status
-                cursor.execute("""
-                    INSERT INTO links 
-                    (url, domain, first_seen, last_seen, url_hash, seen_count,
-                     is_blacklisted, blacklisted_date, blacklist_reason)
-                    VALUES (?, ?, ?, ?, ?, ?, TRUE, ?, ?)
-                """, (
-                    url, domain, blacklist_date, blacklist_date, url_hash, 1,
-                    blacklist_date, scenario['reason']
-                ))
-        
-        conn.commit()
+    today = date.today()
+    urls, dates, reasons = [], [], []
+    for scenario in test_scenarios:
+        blacklist_date = (today - timedelta(days=scenario['days_ago'])).isoformat()
+        urls.extend(scenario['urls'])
+        dates.extend([blacklist_date] * len(scenario['urls']))
+        reasons.extend([scenario['reason']] * len(scenario['urls']))
+    
+    hashes = map(link_manager._hash_url, urls)
+    domains = map(link_manager._extract_domain, urls)
+    rows = [
+        (url, domain, blacklist_date, blacklist_date, url_hash, 1, blacklist_date, reason)
+        for url, domain, blacklist_date, url_hash, reason in zip(urls, domains, dates, hashes, reasons)
+    ]
+    
+    conn = sqlite3.connect(link_manager.db_uri or link_manager.db_path,
+                           uri=link_manager.db_uri is not None, isolation_level=None)
+    try:
+        values = ",\n".join(
+            "({0}, {1}, {2}, {3}, {4}, {5}, TRUE, {6}, {7})".format(*map(_sql_literal, row))
+            for row in rows
+        )
+        conn.executescript(f"""
+            BEGIN IMMEDIATE;
+            INSERT INTO links 
+            (url, domain, first_seen, last_seen, url_hash, seen_count,
+             is_blacklisted, blacklisted_date, blacklist_reason)
+            VALUES {values};
+            COMMIT;
+        """)
+    finally:
+        conn.close()
 
 def test_rewind_preview():
     """Test the rewind preview functionality."""
     print("🔍 Testing Rewind Preview Functionality")
     print("=" * 50)
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        db_path = Path(temp_dir) / "test_rewind.db"
-        logger = setup_test_logger()
-        
-        # Create test data
-        link_manager = LinkManager(db_path, logger=logger)
-        create_test_data(link_manager)
-        
-        # Create rewind tool
-        rewind_tool = BlacklistRewind(db_path, logger=logger)
-        
-        # Test 3-day preview (should find recent links)
-        print("\n📅 3-day rewind preview:")
-        preview_3d = rewind_tool.preview_rewind(3)
-        print(f"   Links to restore: {preview_3d['restore_count']}")
-        print(f"   Cutoff date: {preview_3d['cutoff_date']}")
-        
-        expected_3d = 4  # 2 links from 1 day ago + 2 links from 2 days ago
-        if preview_3d['restore_count'] == expected_3d:
-            print(f"   ✅ CORRECT: Found {expected_3d} links within 3 days")
-        else:
-            print(f"   ❌ ERROR: Expected {expected_3d}, got {preview_3d['restore_count']}")
-            return False
-        
-        # Test 7-day preview (should find recent + medium links)
-        print("\n📅 7-day rewind preview:")
-        preview_7d = rewind_tool.preview_rewind(7)
-        print(f"   Links to restore: {preview_7d['restore_count']}")
-        
-        expected_7d = 6  # 4 recent links (1-2 days) + 2 medium links (7 days) - cutoff is >= 7 days back
-        if preview_7d['restore_count'] == expected_7d:
-            print(f"   ✅ CORRECT: Found {expected_7d} links within 7 days")
-        else:
-            print(f"   ❌ ERROR: Expected {expected_7d}, got {preview_7d['restore_count']}")
-            return False
-        
-        # Test 20-day preview (should find all test links)
-        print("\n📅 20-day rewind preview:")
-        preview_20d = rewind_tool.preview_rewind(20)
-        print(f"   Links to restore: {preview_20d['restore_count']}")
-        
-        expected_20d = 8  # All 8 test links
-        if preview_20d['restore_count'] == expected_20d:
-            print(f"   ✅ CORRECT: Found all {expected_20d} test links within 20 days")
-        else:
-            print(f"   ❌ ERROR: Expected {expected_20d}, got {preview_20d['restore_count']}")
-            return False
-        
-        # Test reason breakdown
-        print(f"\n📊 Reason breakdown for 20-day preview:")
-        for reason, count in preview_20d['reason_breakdown'].items():
-            print(f"   {reason}: {count} links")
-        
-        expected_reasons = {'read': 6, 'not_interested': 2}
-        if preview_20d['reason_breakdown'] == expected_reasons:
-            print(f"   ✅ CORRECT: Reason breakdown matches expected")
-        else:
-            print(f"   ❌ ERROR: Reason breakdown mismatch")
-            print(f"      Expected: {expected_reasons}")
-            print(f"      Got: {preview_20d['reason_breakdown']}")
-            return False
-        
-        return True
+    db = _fresh_db()
+    logger = setup_test_logger()
+    
+    # Create test data
+    link_manager = LinkManager(TEST_DB_URI, logger=logger)
+    create_test_data(link_manager)
+    
+    # Rewind queries should be served by the composite blacklist index
+    with db as conn:
+        plan = conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT url FROM links
+            WHERE is_blacklisted = TRUE AND blacklisted_date >= ?
+        """, (date.today().isoformat(),)).fetchall()
+    
+    if any('idx_links_blacklisted_date' in row[-1] for row in plan):
+        print("   ✅ Rewind query uses idx_links_blacklisted_date")
+    else:
+        print(f"   ❌ ERROR: Rewind query does not use the blacklist index: {plan}")
+        return False
+    
+    # Create rewind tool
+    rewind_tool = BlacklistRewind(TEST_DB_URI, logger=logger)
+    
+    # Test 3-day preview (should find recent links)
+    print("\n📅 3-day rewind preview:")
+    preview_3d = _preview(rewind_tool, 3)
+    print(f"   Links to restore: {preview_3d['restore_count']}")
+    print(f"   Cutoff date: {preview_3d['cutoff_date']}")
+    
+    expected_3d = 4  # 2 links from 1 day ago + 2 links from 2 days ago
+    if preview_3d['restore_count'] == expected_3d:
+        print(f"   ✅ CORRECT: Found {expected_3d} links within 3 days")
+    else:
+        print(f"   ❌ ERROR: Expected {expected_3d}, got {preview_3d['restore_count']}")
+        return False
+    
+    # Test 7-day preview (should find recent + medium links)
+    print("\n📅 7-day rewind preview:")
+    preview_7d = _preview(rewind_tool, 7)
+    print(f"   Links to restore: {preview_7d['restore_count']}")
+    
+    expected_7d = 6  # 4 recent links (1-2 days) + 2 medium links (7 days) - cutoff is >= 7 days back
+    if preview_7d['restore_count'] == expected_7d:
+        print(f"   ✅ CORRECT: Found {expected_7d} links within 7 days")
+    else:
+        print(f"   ❌ ERROR: Expected {expected_7d}, got {preview_7d['restore_count']}")
+        return False
+    
+    # Test 20-day preview (should find all test links)
+    print("\n📅 20-day rewind preview:")
+    preview_20d = _preview(rewind_tool, 20)
+    print(f"   Links to restore: {preview_20d['restore_count']}")
+    
+    expected_20d = 8  # All 8 test links
+    if preview_20d['restore_count'] == expected_20d:
+        print(f"   ✅ CORRECT: Found all {expected_20d} test links within 20 days")
+    else:
+        print(f"   ❌ ERROR: Expected {expected_20d}, got {preview_20d['restore_count']}")
+        return False
+    
+    # Test reason breakdown
+    print(f"\n📊 Reason breakdown for 20-day preview:")
+    for reason, count in preview_20d['reason_breakdown'].items():
+        print(f"   {reason}: {count} links")
+    
+    expected_reasons = {'read': 6, 'not_interested': 2}
+    if preview_20d['reason_breakdown'] == expected_reasons:
+        print(f"   ✅ CORRECT: Reason breakdown matches expected")
+    else:
+        print(f"   ❌ ERROR: Reason breakdown mismatch")
+        print(f"      Expected: {expected_reasons}")
+        print(f"      Got: {preview_20d['reason_breakdown']}")
+        return False
+    
+    return True
 
 def test_rewind_operation():
     """Test the actual rewind operation."""
     print(f"\n⏪ Testing Rewind Operation")
     print("=" * 50)
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        db_path = Path(temp_dir) / "test_rewind_op.db"
-        logger = setup_test_logger()
-        
-        # Create test data
-        link_manager = LinkManager(db_path, logger=logger)
-        create_test_data(link_manager)
-        
-        # Verify initial state
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM links WHERE is_blacklisted = TRUE")
-            initial_blacklisted = cursor.fetchone()[0]
-        
-        print(f"   Initial blacklisted links: {initial_blacklisted}")
-        
-        # Create rewind tool and perform 7-day rewind
-        rewind_tool = BlacklistRewind(db_path, logger=logger)
-        
-        print(f"\n🔄 Performing 7-day rewind:")
-        result = rewind_tool.perform_rewind(7, create_backup=False)  # Skip backup for test
-        
-        if not result['success']:
-            print(f"   ❌ ERROR: Rewind operation failed")
-            return False
-        
-        print(f"   Restored links: {result['restored_count']}")
-        print(f"   Cutoff date: {result['cutoff_date']}")
-        
-        # Verify database state after rewind
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM links WHERE is_blacklisted = TRUE")
-            remaining_blacklisted = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM links WHERE is_blacklisted = FALSE")
-            now_available = cursor.fetchone()[0]
-        
-        print(f"   Remaining blacklisted: {remaining_blacklisted}")
-        print(f"   Now available: {now_available}")
-        
-        # Verify correct links were restored
-        expected_restored = 6  # Links from 1-2 days ago + 7 days ago
-        expected_remaining = 2  # Links from 14+ days ago
-        
-        if (result['restored_count'] == expected_restored and 
-            remaining_blacklisted == expected_remaining):
-            print(f"   ✅ CORRECT: {expected_restored} recent links restored, {expected_remaining} old links remain blacklisted")
-        else:
-            print(f"   ❌ ERROR: Unexpected restoration counts")
-            return False
-        
-        # Test that blacklist status was correctly updated
-        print(f"\n🔍 Testing blacklist status after rewind:")
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Check restored link status
-            cursor.execute("SELECT is_blacklisted FROM links WHERE url = ?", 
-                          ('https://example.com/recent-article-1',))
-            restored_link_blacklisted = cursor.fetchone()[0]
-            
-            # Check old link status (should still be blacklisted)
-            cursor.execute("SELECT is_blacklisted FROM links WHERE url = ?", 
-                          ('https://example.com/old-article-1',))
-            old_link_blacklisted = cursor.fetchone()[0]
-        
-        print(f"   Restored link blacklisted: {bool(restored_link_blacklisted)}")
-        print(f"   Old link blacklisted: {bool(old_link_blacklisted)}")
+    db = _fresh_db()
+    logger = setup_test_logger()
+    
+    # Create test data
+    link_manager = LinkManager(TEST_DB_URI, logger=logger)
+    create_test_data(link_manager)
+    
+    # Verify initial state
+    with db as conn:
+        cursor = conn.cursor()
+        cursor.execute(BLACKLIST_COUNTS_SQL)
+        initial_blacklisted = cursor.fetchone()[0]
+    
+    print(f"   Initial blacklisted links: {initial_blacklisted}")
+    
+    # Create rewind tool and perform 7-day rewind
+    rewind_tool = BlacklistRewind(TEST_DB_URI, logger=logger)
+    
+    print(f"\n🔄 Performing 7-day rewind:")
+    result = rewind_tool.perform_rewind(7, create_backup=False)  # Skip backup for test
+    
+    if not result['success']:
+        print(f"   ❌ ERROR: Rewind operation failed")
+        return False
+    
+    print(f"   Restored links: {result['restored_count']}")
+    print(f"   Cutoff date: {result['cutoff_date']}")
+    
+    # Verify database state after rewind
+    with db as conn:
+        cursor = conn.cursor()
+        cursor.execute(BLACKLIST_COUNTS_SQL)
+        remaining_blacklisted, now_available = cursor.fetchone()
+    
+    print(f"   Remaining blacklisted: {remaining_blacklisted}")
+    print(f"   Now available: {now_available}")
+    
+    # Verify correct links were restored
+    expected_restored = 6  # Links from 1-2 days ago + 7 days ago
+    expected_remaining = 2  # Links from 14+ days ago
+    
+    if (result['restored_count'] == expected_restored and 
+        remaining_blacklisted == expected_remaining):
+        print(f"   ✅ CORRECT: {expected_restored} recent links restored, {expected_remaining} old links remain blacklisted")
+    else:
+        print(f"   ❌ ERROR: Unexpected restoration counts")
+        return False
+    
+    # Test that blacklist status was correctly updated
+    print(f"\n🔍 Testing blacklist status after rewind:")
+    with db as conn:
+        cursor = conn.cursor()
         
-        if (not restored_link_blacklisted and old_link_blacklisted):
-            print(f"   ✅ CORRECT: Restored link available, old link still blacklisted")
-        else:
-            print(f"   ❌ ERROR: Blacklist status not as expected after rewind")
-            return False
+        # Check restored link status
+        cursor.execute("SELECT is_blacklisted FROM links WHERE url = ?", 
+                      ('https://example.com/recent-article-1',))
+        restored_link_blacklisted = cursor.fetchone()[0]
         
-        return True
+        # Check old link status (should still be blacklisted)
+        cursor.execute("SELECT is_blacklisted FROM links WHERE url = ?", 
+                      ('https://example.com/old-article-1',))
+        old_link_blacklisted = cursor.fetchone()[0]
+    
+    print(f"   Restored link blacklisted: {bool(restored_link_blacklisted)}")
+    print(f"   Old link blacklisted: {bool(old_link_blacklisted)}")
+    
+    if (not restored_link_blacklisted and old_link_blacklisted):
+        print(f"   ✅ CORRECT: Restored link available, old link still blacklisted")
+    else:
+        print(f"   ❌ ERROR: Blacklist status not as expected after rewind")
+        return False
+    
+    return True
 
 def test_backup_and_restore():
     """Test backup creation and restoration functionality."""
@@ -254,15 +318,15 @@ def test_backup_and_restore():
     print("=" * 50)
     
     with tempfile.TemporaryDirectory() as temp_dir:
-        db_path = Path(temp_dir) / "test_backup.db"
+        db = _fresh_db()
         logger = setup_test_logger()
         
         # Create test data
-        link_manager = LinkManager(db_path, logger=logger)
+        link_manager = LinkManager(TEST_DB_URI, logger=logger)
         create_test_data(link_manager)
         
         # Create rewind tool
-        rewind_tool = BlacklistRewind(db_path, logger=logger)
+        rewind_tool = BlacklistRewind(TEST_DB_URI, logger=logger, backup_dir=Path(temp_dir))
         
         # Create backup
         print(f"\n📁 Creating backup:")
@@ -273,9 +337,14 @@ def test_backup_and_restore():
             print(f"   ❌ ERROR: Backup file was not created")
             return False
         
-        # Verify backup content
-        with open(backup_file, 'r') as f:
-            backup_data = json.load(f)
+        # The backup stays one valid JSON document for external tools
+        with open(backup_file) as f:
+            if json.load(f)['total_blacklisted'] != 8:
+                print(f"   ❌ ERROR: Backup file does not hold the expected document")
+                return False
+        
+        # Verify backup content from its summary sidecar
+        backup_data = rewind_tool.read_backup_summary(backup_file)
         
         print(f"   Backup contains: {backup_data['total_blacklisted']} blacklisted links")
         
@@ -289,9 +358,9 @@ def test_backup_and_restore():
         print(f"   Restored {rewind_result['restored_count']} links")
         
         # Verify state changed
-        with sqlite3.connect(db_path) as conn:
+        with db as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM links WHERE is_blacklisted = TRUE")
+            cursor.execute(BLACKLIST_COUNTS_SQL)
             after_rewind_blacklisted = cursor.fetchone()[0]
         
         print(f"   Blacklisted after rewind: {after_rewind_blacklisted}")
@@ -307,9 +376,9 @@ def test_backup_and_restore():
         print(f"   Restored {restore_result['restored_count']} blacklisted links")
         
         # Verify restoration
-        with sqlite3.connect(db_path) as conn:
+        with db as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM links WHERE is_blacklisted = TRUE")
+            cursor.execute(BLACKLIST_COUNTS_SQL)
             after_restore_blacklisted = cursor.fetchone()[0]
         
         print(f"   Blacklisted after restore: {after_restore_blacklisted}")
@@ -327,58 +396,69 @@ def test_statistics_and_recent_lists():
     print(f"\n📊 Testing Statistics and Recent Lists")
     print("=" * 50)
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        db_path = Path(temp_dir) / "test_stats.db"
-        logger = setup_test_logger()
-        
-        # Create test data
-        link_manager = LinkManager(db_path, logger=logger)
-        create_test_data(link_manager)
-        
-        # Create rewind tool
-        rewind_tool = BlacklistRewind(db_path, logger=logger)
-        
-        # Test statistics
-        print(f"\n📈 Getting blacklist statistics:")
-        stats = rewind_tool.get_blacklist_statistics()
-        
-        print(f"   Total blacklisted: {stats['total_blacklisted']}")
-        print(f"   Recent blacklists entries: {len(stats['recent_blacklists'])}")
-        print(f"   Blacklist reasons: {len(stats['blacklist_reasons'])}")
-        
-        if stats['total_blacklisted'] == 8:
-            print(f"   ✅ CORRECT: Found all 8 test blacklisted links")
-        else:
-            print(f"   ❌ ERROR: Expected 8 blacklisted links, got {stats['total_blacklisted']}")
-            return False
-        
-        # Test recent blacklists listing
-        print(f"\n📅 Getting recent blacklists (last 5 days):")
-        recent = rewind_tool.list_recent_blacklists(5)
-        
-        print(f"   Recent blacklists found: {len(recent)}")
-        
-        expected_recent = 4  # Links from 1-2 days ago
-        if len(recent) == expected_recent:
-            print(f"   ✅ CORRECT: Found {expected_recent} recent blacklists")
-        else:
-            print(f"   ❌ ERROR: Expected {expected_recent} recent, got {len(recent)}")
-            return False
-        
-        # Test extended recent listing
-        print(f"\n📅 Getting extended recent blacklists (last 15 days):")
-        recent_extended = rewind_tool.list_recent_blacklists(15)
-        
-        print(f"   Extended recent blacklists: {len(recent_extended)}")
-        
-        expected_extended = 8  # All links are within 15 days (1,2,7,14 days ago)
-        if len(recent_extended) == expected_extended:
-            print(f"   ✅ CORRECT: Found {expected_extended} extended recent blacklists")
-        else:
-            print(f"   ❌ ERROR: Expected {expected_extended} extended, got {len(recent_extended)}")
-            return False
-        
-        return True
+    db = _fresh_db()
+    logger = setup_test_logger()
+    
+    # Create test data
+    link_manager = LinkManager(TEST_DB_URI, logger=logger)
+    create_test_data(link_manager)
+    
+    # Create rewind tool
+    rewind_tool = BlacklistRewind(TEST_DB_URI, logger=logger)
+    
+    # Test statistics
+    print(f"\n📈 Getting blacklist statistics:")
+    stats = rewind_tool.get_blacklist_statistics()
+    
+    print(f"   Total blacklisted: {stats['total_blacklisted']}")
+    print(f"   Recent blacklists entries: {len(stats['recent_blacklists'])}")
+    print(f"   Blacklist reasons: {len(stats['blacklist_reasons'])}")
+    
+    if stats['total_blacklisted'] == 8:
+        print(f"   ✅ CORRECT: Found all 8 test blacklisted links")
+    else:
+        print(f"   ❌ ERROR: Expected 8 blacklisted links, got {stats['total_blacklisted']}")
+        return False
+    
+    # Test recent blacklists listing
+    print(f"\n📅 Getting recent blacklists (last 5 days):")
+    recent = rewind_tool.list_recent_blacklists(5)
+    
+    print(f"   Recent blacklists found: {len(recent)}")
+    
+    expected_recent = 4  # Links from 1-2 days ago
+    if len(recent) == expected_recent:
+        print(f"   ✅ CORRECT: Found {expected_recent} recent blacklists")
+    else:
+        print(f"   ❌ ERROR: Expected {expected_recent} recent, got {len(recent)}")
+        return False
+    
+    # Test extended recent listing
+    print(f"\n📅 Getting extended recent blacklists (last 15 days):")
+    recent_extended = rewind_tool.list_recent_blacklists(15)
+    
+    print(f"   Extended recent blacklists: {len(recent_extended)}")
+    
+    expected_extended = 8  # All links are within 15 days (1,2,7,14 days ago)
+    if len(recent_extended) == expected_extended:
+        print(f"   ✅ CORRECT: Found {expected_extended} extended recent blacklists")
+    else:
+        print(f"   ❌ ERROR: Expected {expected_extended} extended, got {len(recent_extended)}")
+        return False
+    
+    return True
+
+def _run_buffered(test_func):
+    """Run a test with its prints and log records buffered, then emit them in one write."""
+    buffer = io.StringIO()
+    handler = setup_test_logger().handlers[0]
+    previous_stream = handler.setStream(buffer)
+    try:
+        with contextlib.redirect_stdout(buffer):
+            return test_func()
+    finally:
+        handler.setStream(previous_stream)
+        sys.stdout.write(buffer.getvalue())
 
 def main():
     """Run all rewind functionality tests."""
@@ -397,7 +477,7 @@ def main():
     results = []
     for test_name, test_func in tests:
         try:
-            result = test_func()
+            result = _run_buffered(test_func)
             results.append((test_name, result))
         except Exception as e:
             print(f"❌ {test_name} failed with error: {e}")
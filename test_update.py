@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Test Updater Filesystem and Network Logic
+=========================================
+
+Exercises update.py without touching the real installation: backup ->
+simulated install -> restore in a temporary HOME, the reflink/link/copy
+fallback, tarball unpacking, the cached remote version check and
+__version__ detection.
+"""
+
+import io
+import os
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from unittest import mock
+
+import update
+from update import NeuronAutomationUpdater
+
+@contextmanager
+def _temp_home():
+    """Point HOME at an empty temporary directory for the block."""
+    old_home = os.environ.get("HOME")
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        try:
+            yield Path(home)
+        finally:
+            if old_home is None:
+                del os.environ["HOME"]
+            else:
+                os.environ["HOME"] = old_home
+
+def _make_config(config_dir):
+    """Create a config dir with preserved files, a chrome profile and app scripts."""
+    profile = config_dir / "chrome_profile" / "Default"
+    profile.mkdir(parents=True)
+    (profile / "Preferences").write_text("user prefs")
+    (config_dir / "chrome_profile" / "Empty").mkdir()
+    # Chrome leaves these behind as dangling symlinks
+    os.symlink("host-12345", config_dir / "chrome_profile" / "SingletonLock")
+    (config_dir / "neuron_automation.log").write_text("log lines")
+    (config_dir / "last_run_2025-01-01.txt").write_text("cache")
+    (config_dir / "neuron_automation.py").write_text('__version__ = "1.0.0"\n')
+    # A large write-once cache entry (hard-linkable) and a large SQLite
+    # database Chrome updates in place (must be copied)
+    size = NeuronAutomationUpdater.LINK_MIN_SIZE
+    (profile / "Cache").mkdir()
+    (profile / "Cache" / "data_1").write_bytes(b"c" * size)
+    (profile / "History").write_bytes(NeuronAutomationUpdater.SQLITE_HEADER + b"h" * size)
+    # Chrome keeps its profile private
+    profile.chmod(0o700)
+    profile.parent.chmod(0o700)
+
+def _simulate_install(config_dir):
+    """Do what the installer does to the preserved files: replace them."""
+    prefs = config_dir / "chrome_profile" / "Default" / "Preferences"
+    prefs.unlink()
+    prefs.write_text("installer default")
+    cache = config_dir / "last_run_2025-01-01.txt"
+    cache.unlink()
+    cache.write_text("clobbered")
+    (config_dir / "neuron_automation.py").write_text('__version__ = "2.0.0"\n')
+
+def _check_restored(config_dir):
+    """Whether user data came back and the installed script was kept."""
+    checks = [
+        ((config_dir / "chrome_profile" / "Default" / "Preferences").read_text(), "user prefs"),
+        ((config_dir / "last_run_2025-01-01.txt").read_text(), "cache"),
+        ((config_dir / "neuron_automation.log").read_text(), "log lines"),
+        ((config_dir / "neuron_automation.py").read_text(), '__version__ = "2.0.0"\n'),
+        (os.readlink(config_dir / "chrome_profile" / "SingletonLock"), "host-12345"),
+        ((config_dir / "chrome_profile" / "Empty").is_dir(), True),
+        (oct((config_dir / "chrome_profile").stat().st_mode & 0o777), oct(0o700)),
+        (oct((config_dir / "chrome_profile" / "Default").stat().st_mode & 0o777), oct(0o700)),
+    ]
+    for actual, expected in checks:
+        if actual != expected:
+            print(f"   ❌ Expected {expected!r}, got {actual!r}")
+            return False
+    return True
+
+def test_backup_and_restore():
+    """Backup, simulated install and same-filesystem restore by rename."""
+    print("🧪 Testing backup -> install -> restore (same filesystem)...")
+    
+    with _temp_home():
+        updater = NeuronAutomationUpdater(verbose=False)
+        _make_config(updater.config_dir)
+        
+        backup_dir = updater.backup_user_config()
+        if not backup_dir or backup_dir.parent != updater.config_dir.parent:
+            print(f"   ❌ Backup should sit next to config_dir, got {backup_dir}")
+            return False
+        if "neuron_automation.py" in os.listdir(backup_dir):
+            print("   ❌ App scripts should not be backed up")
+            return False
+        
+        # A backup entry that is the live file itself (a hard link to a
+        # file the install left alone) is skipped by restore
+        log_backup = backup_dir / "neuron_automation.log"
+        log_backup.unlink()
+        os.link(updater.config_dir / "neuron_automation.log", log_backup)
+        
+        _simulate_install(updater.config_dir)
+        if not updater.restore_user_data(backup_dir):
+            print("   ❌ restore_user_data reported failure")
+            return False
+        if not _check_restored(updater.config_dir):
+            return False
+        
+        if not log_backup.exists():
+            print("   ❌ Untouched hard-linked file should have been skipped")
+            return False
+        
+        # The installer's chrome_profile is parked for cleanup()
+        parked = backup_dir / ".replaced" / "chrome_profile" / "Default" / "Preferences"
+        if not parked.exists() or parked.read_text() != "installer default":
+            print("   ❌ Replaced chrome_profile should be parked under .replaced")
+            return False
+        
+        updater.cleanup([backup_dir])
+        if backup_dir.exists():
+            print("   ❌ cleanup() should remove the backup")
+            return False
+    
+    print("   ✅ User data restored by rename; replaced data parked and cleaned up")
+    return True
+
+def test_backup_is_point_in_time():
+    """Files written in place after the backup don't change the backup."""
+    print("🧪 Testing that backups are snapshots, not aliases...")
+    
+    with _temp_home():
+        updater = NeuronAutomationUpdater(verbose=False)
+        updater._copy_method = "link"  # Reflinks are snapshots already
+        _make_config(updater.config_dir)
+        backup_dir = updater.backup_user_config()
+        
+        profile, backup_profile = (d / "chrome_profile" / "Default"
+                                   for d in (updater.config_dir, backup_dir))
+        if not os.path.samefile(profile / "Cache" / "data_1", backup_profile / "Cache" / "data_1"):
+            print("   ❌ Large write-once files should be hard linked")
+            return False
+        
+        # Write in place, without replacing the files
+        with open(updater.config_dir / "neuron_automation.log", "a") as f:
+            f.write(" appended")
+        with open(updater.config_dir / "last_run_2025-01-01.txt", "r+") as f:
+            f.write("CACHE")
+        with open(profile / "History", "r+b") as f:
+            f.seek(len(NeuronAutomationUpdater.SQLITE_HEADER))
+            f.write(b"X")
+        
+        checks = [
+            ((backup_dir / "neuron_automation.log").read_text(), "log lines"),
+            ((backup_dir / "last_run_2025-01-01.txt").read_text(), "cache"),
+            ((backup_profile / "History").read_bytes()[len(NeuronAutomationUpdater.SQLITE_HEADER)], ord("h")),
+        ]
+        for actual, expected in checks:
+            if actual != expected:
+                print(f"   ❌ Backup changed with the live file: expected {expected!r}, got {actual!r}")
+                return False
+        updater.cleanup([backup_dir])
+    
+    print("   ✅ Logs, small files and databases copied; only write-once files linked")
+    return True
+
+def test_stale_backup_cleanup():
+    """Backups left by interrupted updates are removed once they are old."""
+    print("🧪 Testing removal of stale backups...")
+    
+    with _temp_home():
+        updater = NeuronAutomationUpdater(verbose=False)
+        _make_config(updater.config_dir)
+        stale = updater.config_dir.parent / ".neuron_backup_stale"
+        recent = updater.config_dir.parent / ".neuron_backup_recent"
+        for backup in (stale, recent):
+            backup.mkdir()
+            (backup / "neuron_automation.log").write_text("old log")
+        old = time.time() - (updater.STALE_BACKUP_DAYS + 1) * 86400
+        os.utime(stale, (old, old))
+        
+        backup_dir = updater.backup_user_config()
+        if stale.exists() or not recent.exists():
+            print(f"   ❌ Expected only the stale backup removed (stale: {stale.exists()}, recent: {recent.exists()})")
+            return False
+        updater.cleanup([backup_dir])
+    
+    print(f"   ✅ Backups older than {NeuronAutomationUpdater.STALE_BACKUP_DAYS} days removed, recent ones kept")
+    return True
+
+def test_restore_across_filesystems():
+    """Restore falls back to copying when the backup is on another device."""
+    print("🧪 Testing restore across filesystems (copy fallback)...")
+    
+    with _temp_home():
+        updater = NeuronAutomationUpdater(verbose=False)
+        _make_config(updater.config_dir)
+        backup_dir = updater.backup_user_config()
+        _simulate_install(updater.config_dir)
+        
+        real_stat = os.stat
+        
+        def stat_on_other_device(path, *args, **kwargs):
+            result = real_stat(path, *args, **kwargs)
+            if Path(path) == backup_dir:
+                fields = list(result)
+                fields[2] += 1  # st_dev
+                return os.stat_result(fields)
+            return result
+        
+        with mock.patch("update.os.stat", side_effect=stat_on_other_device):
+            restored = updater.restore_user_data(backup_dir)
+        
+        if not restored or not _check_restored(updater.config_dir):
+            return False
+        if not (backup_dir / "chrome_profile").exists():
+            print("   ❌ Copy fallback should leave the backup in place")
+            return False
+        updater.cleanup([backup_dir])
+    
+    print("   ✅ User data restored by copying")
+    return True
+
+def test_copy_method_fallback():
+    """Backup copies degrade from reflink to hard link to a full copy."""
+    print("🧪 Testing reflink -> link -> copy fallback...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Large and write-once, so hard linking is allowed
+        src = Path(temp_dir) / "data_1"
+        src.write_bytes(b"d" * NeuronAutomationUpdater.LINK_MIN_SIZE)
+        updater = NeuronAutomationUpdater(verbose=False)
+        updater._copy_method = "reflink"
+        
+        with mock.patch.object(updater, "_reflink", side_effect=OSError("not supported")):
+            updater._copy_file(src, Path(temp_dir) / "linked")
+        if updater._copy_method != "link" or not os.path.samefile(src, Path(temp_dir) / "linked"):
+            print(f"   ❌ Refused reflink should fall back to a hard link (method: {updater._copy_method})")
+            return False
+        
+        with mock.patch("update.os.link", side_effect=OSError("cross-device")):
+            updater._copy_file(src, Path(temp_dir) / "copied")
+        copied = Path(temp_dir) / "copied"
+        if (updater._copy_method != "copy" or os.path.samefile(src, copied)
+                or copied.read_bytes() != src.read_bytes()):
+            print(f"   ❌ Refused hard link should fall back to a copy (method: {updater._copy_method})")
+            return False
+    
+    print("   ✅ Each refused method is dropped for the rest of the run")
+    return True
+
+def test_tarball_unpacking():
+    """The snapshot's top-level directory is stripped when unpacking."""
+    print("🧪 Testing tarball download and prefix stripping...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive = Path(temp_dir) / "main.tar.gz"
+        with tarfile.open(archive, "w:gz") as tar:
+            for name, data in (("NeuronAutomator-main/neuron_automation.py", b'__version__ = "9.9.9"\n'),
+                               ("NeuronAutomator-main/installers/install_linux.sh", b"#!/bin/bash\n")):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        
+        target = Path(temp_dir) / "unpacked"
+        target.mkdir()
+        updater = NeuronAutomationUpdater(verbose=False)
+        updater.tarball_url = archive.as_uri()
+        updater._download_tarball(target)
+        
+        unpacked = sorted(str(p.relative_to(target)) for p in target.rglob("*") if p.is_file())
+        expected = ["installers/install_linux.sh", "neuron_automation.py"]
+        if unpacked != expected:
+            print(f"   ❌ Expected {expected}, got {unpacked}")
+            return False
+    
+    print("   ✅ Archive unpacked without its top-level directory")
+    return True
+
+def test_remote_version_cache():
+    """The upstream version is cached and revalidated with its ETag."""
+    print("🧪 Testing remote version check and ETag cache...")
+    
+    requests_seen = []
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append((self.headers.get("Range"), self.headers.get("If-None-Match")))
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = b'#!/usr/bin/env python3\n__version__ = "3.1.4"\n'
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with _temp_home():
+            updater = NeuronAutomationUpdater(verbose=False)
+            updater.config_dir.mkdir(parents=True)
+            updater.raw_script_url = f"http://127.0.0.1:{server.server_port}/neuron_automation.py"
+            
+            first = updater.fetch_remote_version()
+            cached = updater.fetch_remote_version()  # within the TTL: no request
+            updater.REMOTE_VERSION_TTL = 0
+            revalidated = updater.fetch_remote_version()
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    if (first, cached, revalidated) != ("3.1.4",) * 3:
+        print(f"   ❌ Versions: {first}, {cached}, {revalidated}")
+        return False
+    if requests_seen != [("bytes=0-4095", None), ("bytes=0-4095", '"v1"')]:
+        print(f"   ❌ Unexpected requests: {requests_seen}")
+        return False
+    
+    print("   ✅ One ranged fetch, one cache hit, one 304 revalidation")
+    return True
+
+def test_read_version():
+    """__version__ detection only accepts assignments at the start of a line."""
+    print("🧪 Testing __version__ detection...")
+    
+    cases = [
+        ('# __version__ = "0.0.1"\n__version__ = "1.5.0"\n', "1.5.0"),
+        ('x = "__version__ = \\"0.0.2\\""\n__version__ = "1.5.1"\n', "1.5.1"),
+        ('if True:\n    __version__ = "1.5.2"', "1.5.2"),
+        ('__version__="1.5.3"', "1.5.3"),
+        ("", None),
+        ("print('no version here')\n", None),
+    ]
+    
+    updater = NeuronAutomationUpdater(verbose=False)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for i, (source, expected) in enumerate(cases):
+            script = Path(temp_dir) / f"script_{i}.py"
+            script.write_text(source)
+            actual = updater._read_version(script)
+            if actual != expected:
+                print(f"   ❌ {source!r}: expected {expected}, got {actual}")
+                return False
+        
+        # A rewritten script is re-read even though its path is cached
+        script = Path(temp_dir) / "script_0.py"
+        script.write_text('__version__ = "2.0.0"\n')
+        os.utime(script, ns=(0, 1))
+        if updater._read_version(script) != "2.0.0":
+            print("   ❌ Cached version should be dropped when the script changes")
+            return False
+    
+    print(f"   ✅ {len(cases)} cases detected correctly")
+    return True
+
+def test_up_to_date_needs_install():
+    """A checkout at the latest version doesn't count as an installation."""
+    print("🧪 Testing up-to-date check with nothing installed...")
+    
+    with _temp_home():
+        updater = NeuronAutomationUpdater(verbose=False)
+        local_version = updater.get_current_version()
+        updater.fetch_remote_version = lambda: local_version
+        
+        with mock.patch("builtins.input", return_value="n") as prompt:
+            updater.run_update()
+        if not prompt.called:
+            print("   ❌ Updater reported 'Already up to date' with nothing installed")
+            return False
+        
+        updater.config_dir.mkdir(parents=True)
+        (updater.config_dir / "neuron_automation.py").write_text(f'__version__ = "{local_version}"\n')
+        with mock.patch("builtins.input", return_value="n") as prompt:
+            result = updater.run_update()
+        if prompt.called or not result:
+            print("   ❌ Installed latest version should be reported as up to date")
+            return False
+    
+    print("   ✅ Only an installed copy at the latest version skips the update")
+    return True
+
+def main():
+    """Run all updater tests."""
+    print("🚀 Updater Test Suite")
+    print("=" * 50)
+    
+    tests = [
+        ("Backup and Restore", test_backup_and_restore),
+        ("Backup Is Point-in-Time", test_backup_is_point_in_time),
+        ("Stale Backup Cleanup", test_stale_backup_cleanup),
+        ("Restore Across Filesystems", test_restore_across_filesystems),
+        ("Copy Method Fallback", test_copy_method_fallback),
+        ("Tarball Unpacking", test_tarball_unpacking),
+        ("Remote Version Cache", test_remote_version_cache),
+        ("Version Detection", test_read_version),
+        ("Up-to-date Check", test_up_to_date_needs_install),
+    ]
+    
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+        print()
+    
+    # Summary
+    print("=" * 50)
+    print("🎯 Test Results Summary:")
+    
+    passed = 0
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"  {status} {test_name}")
+        if result:
+            passed += 1
+    
+    print(f"\nOverall: {passed}/{len(results)} tests passed")
+    
+    if passed == len(results):
+        print("\n🎉 Updater backup, restore and download logic validated!")
+        return True
+    else:
+        print("⚠️ Some tests failed.")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -7,23 +7,29 @@ This test demonstrates the exact user scenario that was concerning:
 testing vs production behavior and proper blacklist management.
 """
 
+import io
+import os
 import sys
 import tempfile
 import sqlite3
+from contextlib import ExitStack, closing, redirect_stdout
+from datetime import date, timedelta
 from pathlib import Path
 from link_manager import LinkManager
 from config import Config  # Use real config
 import logging
 
+# NEURON_QUIET=1 keeps the step-by-step narrative out of CI logs
+VERBOSE = not os.environ.get("NEURON_QUIET")
+
 def setup_logger():
+    # The scenario reports its own progress with print(); LinkManager's
+    # log lines would only duplicate it
     logger = logging.getLogger("user_scenario")
-    logger.setLevel(logging.INFO)
+    logger.propagate = False
     
     if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter('%(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        logger.addHandler(logging.NullHandler())
     
     return logger
 
@@ -33,12 +39,20 @@ def main():
     print("Scenario: User tests installation, then uses it in production")
     print()
     
-    with tempfile.TemporaryDirectory() as temp_dir:
+    # cleanup closes the database connections before the temp dir is removed
+    with tempfile.TemporaryDirectory() as temp_dir, ExitStack() as cleanup:
         db_path = Path(temp_dir) / "user_test.db"
         logger = setup_logger()
         
         # Use actual config (RECENT_LINK_DAYS = 1 by default)
         link_manager = LinkManager(db_path, config=Config, logger=logger)
+        cleanup.callback(link_manager.close)
+        
+        # One connection shared by every verification query
+        verify = cleanup.enter_context(closing(sqlite3.connect(db_path)))
+        
+        def count_links():
+            return verify.execute("SELECT COUNT(*) FROM links").fetchone()[0]
         
         # Simulate newsletter links
         newsletter_links = [
@@ -61,10 +75,7 @@ def main():
         print(f"   ✅ Would open {len(analysis['links_to_open'])} links")
         
         # Check database
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM links")
-            stored_count = cursor.fetchone()[0]
+        stored_count = count_links()
         
         print(f"   📊 Database state: {stored_count} links stored")
         if stored_count == 0:
@@ -87,10 +98,7 @@ def main():
         
         record_result = link_manager.record_opened_links(successfully_opened, "morning_newsletter")
         
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM links")
-            stored_count = cursor.fetchone()[0]
+        stored_count = count_links()
         
         print(f"   📊 Database state: {stored_count} links stored")
         print(f"   ✅ Recorded {record_result['recorded_count']} successfully opened links")
@@ -132,13 +140,12 @@ def main():
         print("   System runs next morning")
         print("   Expected: Yesterday's links now available again (if user wants)")
         
-        # Simulate next day by creating a new LinkManager with modified config
-        class NextDayConfig:
-            RECENT_LINK_DAYS = 0  # Simulate "yesterday" is now > threshold
-            
-        # This simulates time passing - in real usage, the dates would naturally differ
+        # Simulate time passing by moving LinkManager's clock past the threshold
+        # - in real usage, the dates would naturally differ
         print("   (Simulating passage of time...)")
-        print("   ⏰ Yesterday's links are now > RECENT_LINK_DAYS threshold")
+        days_later = Config.RECENT_LINK_DAYS + 1
+        link_manager._today = lambda: date.today() + timedelta(days=days_later)
+        print(f"   ⏰ Opened links are now {days_later} days old (> RECENT_LINK_DAYS threshold)")
         
         next_day_analysis = link_manager.analyze_newsletter_links(newsletter_links)
         
@@ -147,29 +154,41 @@ def main():
         
         # With RECENT_LINK_DAYS=1, all previously opened links should now be available again
         # (This demonstrates the "limits not restricts" behavior)
+        if len(next_day_analysis['links_to_open']) != len(newsletter_links):
+            print("   ❌ ERROR: Opened links should be available again after the threshold")
+            return False
         print("   ✅ Previously read content becomes available again after threshold period")
         print("   🎯 This demonstrates 'limits not fully restricts' principle")
         
         return True
 
 if __name__ == "__main__":
-    success = main()
+    if VERBOSE:
+        success = main()
+    else:
+        # Hold the narrative back and only show it if the scenario fails
+        with redirect_stdout(io.StringIO()) as transcript:
+            success = main()
+        if not success:
+            sys.stdout.write(transcript.getvalue())
     
     if success:
         print(f"\n🎉 User Scenario Test PASSED!")
-        print(f"\n📋 Key Benefits Demonstrated:")
-        print(f"  ✅ Testing does not pollute blacklist database")
-        print(f"  ✅ Only successfully opened links get recorded") 
-        print(f"  ✅ Failed tab openings do not affect database")
-        print(f"  ✅ Recent links blocked from re-opening (prevents spam)")
-        print(f"  ✅ Old content becomes available again (limits, not restricts)")
-        print(f"  ✅ Blacklist system is intelligent and user-friendly")
-        
-        print(f"\n🔧 Technical Implementation:")
-        print(f"  • analyze_newsletter_links(): Safe analysis without database writes") 
-        print(f"  • record_opened_links(): Only stores successfully opened links")
-        print(f"  • RECENT_LINK_DAYS: Configurable threshold for re-opening")
-        print(f"  • Automation script: analyze → open → record pattern")
+        
+        if VERBOSE:
+            print(f"\n📋 Key Benefits Demonstrated:")
+            print(f"  ✅ Testing does not pollute blacklist database")
+            print(f"  ✅ Only successfully opened links get recorded") 
+            print(f"  ✅ Failed tab openings do not affect database")
+            print(f"  ✅ Recent links blocked from re-opening (prevents spam)")
+            print(f"  ✅ Old content becomes available again (limits, not restricts)")
+            print(f"  ✅ Blacklist system is intelligent and user-friendly")
+        
+            print(f"\n🔧 Technical Implementation:")
+            print(f"  • analyze_newsletter_links(): Safe analysis without database writes") 
+            print(f"  • record_opened_links(): Only stores successfully opened links")
+            print(f"  • RECENT_LINK_DAYS: Configurable threshold for re-opening")
+            print(f"  • Automation script: analyze → open → record pattern")
     else:
         print(f"\n❌ User Scenario Test FAILED!")
         
@@ -8,13 +8,22 @@ from GitHub while preserving user configurations and settings.
 """
 
 import os
+import re
+import fnmatch
+import hashlib
 import sys
 import json
+import mmap
+import time
 import shutil
 import subprocess
+import tarfile
 import tempfile
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import platform
 
 __version__ = "1.0.0"
@@ -22,10 +31,47 @@ __version__ = "1.0.0"
 class NeuronAutomationUpdater:
     """Handles updating the Neuron Automation system."""
     
-    def __init__(self):
+    COPY_WORKERS = 8  # Parallel file copies when backing up configuration
+    FICLONE = 0x40049409  # Linux ioctl: share a file's extents copy-on-write (btrfs, xfs)
+    
+    # A hard link aliases the live file, so it is only a snapshot of files
+    # nobody rewrites in place. Those are taken to be large, write-once
+    # files (e.g. Chrome's cache entries); small files, logs, configs and
+    # SQLite databases (Chrome's have no extension) are always copied.
+    LINK_MIN_SIZE = 1 << 20
+    MUTABLE_SUFFIXES = (".db", ".sqlite", ".log", ".json", ".py", ".txt", "-journal", "-wal")
+    SQLITE_HEADER = b"SQLite format 3\0"
+    
+    STALE_BACKUP_DAYS = 7  # Backups left by interrupted updates are kept this long
+    
+    # Files to preserve
+    PRESERVE_FILES = (
+        "neuron_automation.log",
+        "last_run_*.txt",  # Cache files
+        "chrome_profile/",  # Chrome profile data
+        "custom_config.py"  # User customizations
+    )
+    # All of the above as one matcher for config_dir entry names
+    PRESERVE_PATTERN = re.compile("|".join(fnmatch.translate(p.rstrip("/")) for p in PRESERVE_FILES))
+    
+    # What install_linux.sh checks for and copies into config_dir; read from
+    # the downloaded installer so the lists aren't duplicated here
+    REQUIRED_FILES_PATTERN = re.compile(r'^REQUIRED_FILES=\(([^)]*)\)', re.M)
+    INSTALLER_COPY_PATTERN = re.compile(r'^cp "\$SCRIPT_DIR/([^"/]+)" "\$CONFIG_DIR/"', re.M)
+    
+    # A __version__ assignment at the start of a line (not in a comment)
+    VERSION_PATTERN = re.compile(r'(?m)^[ \t]*__version__\s*=\s*"([^"]+)"')
+    VERSION_BYTES_PATTERN = re.compile(VERSION_PATTERN.pattern.encode())
+    REMOTE_VERSION_TTL = 3600  # Seconds to trust a cached upstream version
+    
+    def __init__(self, legacy_installer: bool = False, verbose: bool = True):
+        self.legacy_installer = legacy_installer
+        self.verbose = verbose
         self.current_dir = Path(__file__).parent.absolute()
         self.platform = platform.system().lower()
         self.github_url = "https://github.com/pem725/NeuronAutomator.git"
+        self.tarball_url = "https://github.com/pem725/NeuronAutomator/archive/refs/heads/main.tar.gz"
+        self.raw_script_url = "https://raw.githubusercontent.com/pem725/NeuronAutomator/main/neuron_automation.py"
         
         # Platform-specific paths
         if self.platform == "windows":
@@ -37,84 +83,304 @@ class NeuronAutomationUpdater:
         else:  # Linux
             self.config_dir = Path.home() / ".config" / "neuron-automation"
             self.install_dir = Path("/usr/local/bin")
+        
+        # Cheapest backup copy method still believed to work; downgraded
+        # to "link" and then "copy" the first time a method is refused
+        self._copy_method = "reflink" if self.platform == "linux" else "link"
+        
+        self.update_cache_file = self.config_dir / ".update_cache.json"
+        # Digest of the install_linux.sh + requirements.txt last run in full
+        self.installer_digest_file = self.config_dir / ".installer_digest"
+        
+        # Script path -> (mtime_ns, version) so repeat version checks skip the read
+        self._version_cache: Dict[Path, Tuple[int, Optional[str]]] = {}
+    
+    def _status(self, message: str) -> None:
+        """Print a progress line; warnings and errors use print() directly."""
+        if self.verbose:
+            print(message)
+    
+    def _load_update_cache(self) -> Dict[str, Any]:
+        """Load the cached upstream version check, if any."""
+        try:
+            with open(self.update_cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_update_cache(self, cache: Dict[str, Any]) -> None:
+        """Persist the upstream version check; skipped before first install."""
+        if not self.config_dir.exists():
+            return
+        try:
+            with open(self.update_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+        except OSError:
+            pass
+    
+    def fetch_remote_version(self) -> Optional[str]:
+        """
+        Get the __version__ of neuron_automation.py on GitHub's main branch.
+        
+        Only the first 4 KB of the script are requested (the version line is
+        near the top). The result is cached in config_dir/.update_cache.json
+        for REMOTE_VERSION_TTL seconds, and after that revalidated with the
+        stored ETag so an unchanged file costs a 304 with no body.
+        """
+        cache = self._load_update_cache()
+        if cache.get('remote_version') and time.time() - cache.get('checked_at', 0) < self.REMOTE_VERSION_TTL:
+            return cache['remote_version']
+        
+        request = urllib.request.Request(self.raw_script_url, headers={'Range': 'bytes=0-4095'})
+        if cache.get('etag') and cache.get('remote_version'):
+            request.add_header('If-None-Match', cache['etag'])
+        
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                head = response.read(4096).decode('utf-8', errors='replace')
+                etag = response.headers.get('ETag')
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                print(f"Warning: Could not check latest version: {e}")
+                return None
+            version, etag = cache['remote_version'], cache['etag']
+        except OSError as e:
+            print(f"Warning: Could not check latest version: {e}")
+            return None
+        else:
+            match = self.VERSION_PATTERN.search(head)
+            if not match:
+                return None
+            version = match.group(1)
+        
+        self._save_update_cache({'remote_version': version, 'etag': etag, 'checked_at': time.time()})
+        return version
+    
+    def _read_version(self, script: Path) -> Optional[str]:
+        """Return the __version__ declared in a script, reading only up to it."""
+        mtime = script.stat().st_mtime_ns
+        cached = self._version_cache.get(script)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        version = None
+        with open(script, 'rb') as f:
+            # mmap can't map an empty file
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # Search the mapping directly; nothing is decoded but
+                    # the version string itself
+                    match = self.VERSION_BYTES_PATTERN.search(mm)
+                    if match:
+                        version = match.group(1).decode('utf-8', errors='replace')
+        
+        self._version_cache[script] = (mtime, version)
+        return version
     
     def get_current_version(self) -> Optional[str]:
         """Get the current installed version."""
         try:
-            # Try to get version from neuron_automation.py
-            main_script = self.config_dir / "neuron_automation.py"
-            if main_script.exists():
-                with open(main_script, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    for line in content.split('\n'):
-                        if line.strip().startswith('__version__'):
-                            return line.split('"')[1]
-            
-            # Fallback: try current directory
-            local_script = self.current_dir / "neuron_automation.py"
-            if local_script.exists():
-                with open(local_script, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    for line in content.split('\n'):
-                        if line.strip().startswith('__version__'):
-                            return line.split('"')[1]
+            # Try to get version from neuron_automation.py, then fall back
+            # to the copy in the current directory
+            for script in (self.config_dir / "neuron_automation.py",
+                           self.current_dir / "neuron_automation.py"):
+                if script.exists():
+                    version = self._read_version(script)
+                    if version:
+                        return version
             
             return None
         except Exception as e:
             print(f"Warning: Could not determine current version: {e}")
             return None
     
+    @staticmethod
+    def _prepare_tree(src_dir: Path, dst_dir: Path,
+                      dir_pairs: List[Tuple[Path, Path]]) -> List[Tuple[Path, Path]]:
+        """
+        Recreate src_dir's directories under dst_dir and list the
+        (source, destination) pairs for every file that needs copying.
+        
+        Each directory pair is appended to dir_pairs, parents first, so
+        the caller can copy their modes and timestamps once the files are in.
+        """
+        pairs = []
+        for root, dirs, files in os.walk(src_dir):
+            rel_root = Path(root).relative_to(src_dir)
+            (dst_dir / rel_root).mkdir(parents=True, exist_ok=True)
+            dir_pairs.append((Path(root), dst_dir / rel_root))
+            # os.walk doesn't descend into symlinked dirs; copy those as links
+            for name in files + [d for d in dirs if os.path.islink(os.path.join(root, d))]:
+                pairs.append((Path(root) / name, dst_dir / rel_root / name))
+        return pairs
+    
+    def _reflink(self, src: Path, dst: Path) -> None:
+        """Clone src into dst copy-on-write, without copying any data."""
+        import fcntl
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            fcntl.ioctl(fdst.fileno(), self.FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+    
+    def _linkable(self, src: Path) -> bool:
+        """Whether a hard link to src is safe to use as its backup (see LINK_MIN_SIZE)."""
+        if os.stat(src).st_size < self.LINK_MIN_SIZE or src.name.endswith(self.MUTABLE_SUFFIXES):
+            return False
+        with open(src, 'rb') as f:
+            return f.read(len(self.SQLITE_HEADER)) != self.SQLITE_HEADER
+    
+    def _copy_file(self, src: Path, dst: Path) -> None:
+        """
+        Back up one file as cheaply as the filesystem allows.
+        
+        Tries a copy-on-write reflink, then a hard link for files _linkable()
+        accepts (the backup sits on the same filesystem), then a full copy.
+        Symlinks are recreated, not followed.
+        """
+        if src.is_symlink():
+            os.symlink(os.readlink(src), dst)
+            return
+        
+        if self._copy_method == "reflink":
+            try:
+                self._reflink(src, dst)
+                return
+            except OSError:
+                dst.unlink(missing_ok=True)
+                self._copy_method = "link"
+        
+        if self._copy_method == "link" and self._linkable(src):
+            try:
+                os.link(src, dst)
+                return
+            except OSError:
+                self._copy_method = "copy"
+        
+        shutil.copy2(src, dst)
+    
+    def _copy_files(self, pairs: List[Tuple[Path, Path]]) -> None:
+        """Copy many files, overlapping their I/O across a thread pool."""
+        for parent in {dst.parent for _, dst in pairs}:
+            parent.mkdir(parents=True, exist_ok=True)
+        
+        if self.platform == "windows" or len(pairs) < 2:
+            for src, dst in pairs:
+                self._copy_file(src, dst)
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.COPY_WORKERS) as executor:
+            # list() re-raises the first copy error, if any
+            list(executor.map(lambda pair: self._copy_file(*pair), pairs))
+    
+    def _remove_stale_backups(self) -> None:
+        """
+        Delete backups that interrupted updates left next to config_dir.
+        
+        A crash between install and restore leaves the only copy of the
+        user's data in such a backup, so they are kept for
+        STALE_BACKUP_DAYS for manual recovery before being removed.
+        """
+        cutoff = time.time() - self.STALE_BACKUP_DAYS * 86400
+        for stale in self.config_dir.parent.glob(".neuron_backup_*"):
+            try:
+                if stale.is_dir() and stale.stat().st_mtime < cutoff:
+                    self._status(f"🧹 Removing backup left by an interrupted update: {stale}")
+                    shutil.rmtree(stale)
+            except OSError as e:
+                print(f"Warning: Could not remove stale backup {stale}: {e}")
+    
     def backup_user_config(self) -> Optional[Path]:
-        """Backup user configuration files."""
+        """
+        Backup user configuration files.
+        
+        The backup is a ".neuron_backup_*" directory beside config_dir. It is
+        removed by cleanup() after the update; one left behind by a crash
+        is removed by a later update once it is STALE_BACKUP_DAYS old.
+        """
         if not self.config_dir.exists():
-            print("No existing configuration found - fresh installation")
+            self._status("No existing configuration found - fresh installation")
             return None
         
-        backup_dir = Path(tempfile.mkdtemp(prefix="neuron_backup_"))
-        print(f"📦 Backing up configuration to: {backup_dir}")
+        self._remove_stale_backups()
         
+        # Keep the backup on the config dir's filesystem so files can be
+        # reflinked or hard linked instead of copied
         try:
-            # Files to preserve
-            preserve_files = [
-                "neuron_automation.log",
-                "last_run_*.txt",  # Cache files
-                "chrome_profile/",  # Chrome profile data
-                "custom_config.py"  # User customizations
-            ]
+            backup_dir = Path(tempfile.mkdtemp(prefix=".neuron_backup_", dir=self.config_dir.parent))
+        except OSError:
+            backup_dir = Path(tempfile.mkdtemp(prefix="neuron_backup_"))
+        self._status(f"📦 Backing up configuration to: {backup_dir}")
+        
+        try:
+            # Gather every file first (chrome_profile alone holds thousands)
+            # so the copies can run in parallel; config_dir is listed once and
+            # each entry checked against all PRESERVE_FILES patterns
+            pairs, dir_pairs = [], []
+            with os.scandir(self.config_dir) as entries:
+                for entry in entries:
+                    if not self.PRESERVE_PATTERN.match(entry.name):
+                        continue
+                    
+                    # d_type from readdir answers these without a stat;
+                    # symlinks are backed up as links by _copy_file
+                    if entry.is_dir(follow_symlinks=False):
+                        pairs.extend(self._prepare_tree(Path(entry.path), backup_dir / entry.name,
+                                                        dir_pairs))
+                    else:
+                        pairs.append((Path(entry.path), backup_dir / entry.name))
             
-            for pattern in preserve_files:
-                if "*" in pattern:
-                    # Handle glob patterns
-                    for file_path in self.config_dir.glob(pattern):
-                        if file_path.is_file():
-                            shutil.copy2(file_path, backup_dir / file_path.name)
-                        elif file_path.is_dir():
-                            shutil.copytree(file_path, backup_dir / file_path.name, dirs_exist_ok=True)
-                else:
-                    file_path = self.config_dir / pattern
-                    if file_path.exists():
-                        if file_path.is_file():
-                            shutil.copy2(file_path, backup_dir / pattern)
-                        elif file_path.is_dir():
-                            shutil.copytree(file_path, backup_dir / pattern, dirs_exist_ok=True)
+            self._copy_files(pairs)
             
+            # Keep directory modes (chrome_profile is 0700) and timestamps;
+            # bottom-up, since filling a directory bumps its mtime
+            for src, dst in reversed(dir_pairs):
+                shutil.copystat(src, dst)
             return backup_dir
         except Exception as e:
             print(f"❌ Backup failed: {e}")
             return None
     
+    def _download_tarball(self, target_dir: Path) -> None:
+        """Stream the main branch snapshot from GitHub and unpack it into target_dir."""
+        with urllib.request.urlopen(self.tarball_url, timeout=60) as response:
+            with tarfile.open(fileobj=response, mode="r|gz") as tar:
+                for member in tar:
+                    # Drop the archive's top-level "NeuronAutomator-main/" directory
+                    relative = member.name.partition('/')[2]
+                    if not relative:
+                        continue
+                    member.name = relative
+                    
+                    if hasattr(tarfile, 'data_filter'):
+                        tar.extract(member, target_dir, filter='data')
+                    else:
+                        # Older Pythons lack extraction filters; refuse paths
+                        # and links that could escape target_dir
+                        if (Path(relative).is_absolute() or '..' in Path(relative).parts
+                                or member.issym() or member.islnk()):
+                            raise tarfile.TarError(f"Unsafe path in archive: {member.name}")
+                        tar.extract(member, target_dir)
+    
     def download_latest_version(self) -> Optional[Path]:
         """Download the latest version from GitHub."""
         temp_dir = Path(tempfile.mkdtemp(prefix="neuron_update_"))
         
-        print("🌐 Downloading latest version from GitHub...")
+        self._status("🌐 Downloading latest version from GitHub...")
+        try:
+            # A snapshot tarball is one small download and needs no git install
+            self._download_tarball(temp_dir)
+            self._status("✅ Download completed successfully")
+            return temp_dir
+        except (OSError, tarfile.TarError) as e:
+            print(f"⚠️ Snapshot download failed ({e}), falling back to git clone")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        
         try:
             # Clone the repository
             result = subprocess.run([
                 "git", "clone", self.github_url, str(temp_dir)
             ], capture_output=True, text=True, check=True)
             
-            print("✅ Download completed successfully")
+            self._status("✅ Download completed successfully")
             return temp_dir
         except subprocess.CalledProcessError as e:
             print(f"❌ Git clone failed: {e.stderr}")
@@ -123,10 +389,103 @@ class NeuronAutomationUpdater:
             print("❌ Git not found. Please install git or download manually.")
             return None
     
+    @staticmethod
+    def _file_digest(path: Path) -> bytes:
+        """Return a short blake2b digest of a file's contents."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+        return digest.digest()
+    
+    def _install_file(self, src: Path, dst: Path) -> bool:
+        """
+        Copy src over dst unless dst already has the same contents.
+        
+        Like rsync's quick check, files of different sizes are copied
+        without reading them; only same-sized files get hashed.
+        """
+        try:
+            same_size = os.stat(src).st_size == os.stat(dst).st_size
+        except FileNotFoundError:
+            same_size = False
+        if same_size and self._file_digest(src) == self._file_digest(dst):
+            return False
+        shutil.copy2(src, dst)
+        return True
+    
+    @staticmethod
+    def _installer_digest(source_dir: Path) -> str:
+        """Digest of the Linux installer and requirements.txt in source_dir."""
+        digest = hashlib.blake2b(digest_size=16)
+        for name in ("installers/install_linux.sh", "requirements.txt"):
+            path = source_dir / name
+            digest.update(path.read_bytes() if path.exists() else b"")
+            digest.update(b"\0")
+        return digest.hexdigest()
+    
+    def _record_installer_digest(self, source_dir: Path) -> None:
+        """Remember which installer last ran in full; see _linux_install_ready."""
+        try:
+            self.installer_digest_file.write_text(self._installer_digest(source_dir), encoding='utf-8')
+        except OSError as e:
+            print(f"Warning: Could not record installer digest: {e}")
+    
+    def _linux_install_ready(self, source_dir: Path) -> bool:
+        """
+        Whether the update can skip install_linux.sh.
+        
+        True only when a previous install left the venv and wrapper in place
+        and was made by the same installer and requirements.txt as the
+        download; a release that adds a module, a dependency or changes the
+        systemd units gets the full installer.
+        """
+        if not ((self.config_dir / "venv" / "bin" / "python3").exists()
+                and (self.install_dir / "neuron-automation").exists()):
+            return False
+        try:
+            recorded = self.installer_digest_file.read_text(encoding='utf-8').strip()
+        except OSError:
+            return False
+        return recorded == self._installer_digest(source_dir)
+    
+    def _install_linux(self, source_dir: Path) -> bool:
+        """
+        Update an existing Linux install in-process.
+        
+        With an unchanged installer the venv, wrapper script and systemd
+        units are already in place, so only the Python scripts install_linux.sh
+        copies need updating. Scripts whose contents already match are left
+        untouched.
+        """
+        installer = (source_dir / "installers" / "install_linux.sh").read_text(encoding='utf-8')
+        required = self.REQUIRED_FILES_PATTERN.search(installer)
+        required = re.findall(r'"([^"]+)"', required.group(1)) if required else []
+        scripts = self.INSTALLER_COPY_PATTERN.findall(installer)
+        
+        missing = [name for name in required if not (source_dir / name).is_file()]
+        if missing:
+            print(f"❌ Error: Required file {missing[0]} not found in {source_dir}")
+            return False
+        
+        pairs = [(source_dir / name, self.config_dir / name)
+                 for name in scripts if (source_dir / name).is_file()]
+        with ThreadPoolExecutor(max_workers=self.COPY_WORKERS) as executor:
+            copied = sum(executor.map(lambda pair: self._install_file(*pair), pairs))
+        (self.config_dir / "neuron_automation.py").chmod(0o755)
+        
+        self._status(f"✅ Installation completed successfully ({copied} of {len(pairs)} scripts changed)")
+        return True
+    
     def install_update(self, source_dir: Path, backup_dir: Optional[Path]) -> bool:
         """Install the update from source directory."""
         try:
-            print("🔧 Installing update...")
+            self._status("🔧 Installing update...")
+            
+            if self.platform == "linux" and not self.legacy_installer:
+                if self._linux_install_ready(source_dir):
+                    return self._install_linux(source_dir)
+                self._status("   Running install_linux.sh (no full install yet with this installer and requirements.txt)")
             
             # Run the appropriate installer
             installer_map = {
@@ -156,7 +515,10 @@ class NeuronAutomationUpdater:
                         "bash", str(installer)
                     ], check=True)
                 
-                print("✅ Installation completed successfully")
+                if self.platform == "linux":
+                    self._record_installer_digest(source_dir)
+                
+                self._status("✅ Installation completed successfully")
                 return True
                 
             finally:
@@ -170,25 +532,56 @@ class NeuronAutomationUpdater:
             return False
     
     def restore_user_data(self, backup_dir: Optional[Path]) -> bool:
-        """Restore user data from backup."""
+        """
+        Restore user data from backup.
+        
+        When the backup sits on config_dir's filesystem (the usual case, see
+        backup_user_config) each entry is renamed back into place instead of
+        copied; replaced directories are parked inside backup_dir so they go
+        away with it in cleanup().
+        """
         if not backup_dir or not backup_dir.exists():
             return True
         
         try:
-            print("📂 Restoring user data...")
+            self._status("📂 Restoring user data...")
+            
+            same_fs = os.stat(backup_dir).st_dev == os.stat(self.config_dir).st_dev
+            replaced_dir = backup_dir / ".replaced"
+            
+            # Restore files; the listing is taken up front because entries
+            # are moved out of backup_dir as we go
+            with os.scandir(backup_dir) as it:
+                entries = [entry for entry in it if entry.name != replaced_dir.name]
             
-            # Restore files
-            for backup_file in backup_dir.iterdir():
-                target_path = self.config_dir / backup_file.name
+            for entry in entries:
+                backup_file = Path(entry.path)
+                target_path = self.config_dir / entry.name
                 
-                if backup_file.is_file():
-                    shutil.copy2(backup_file, target_path)
-                elif backup_file.is_dir():
-                    if target_path.exists():
-                        shutil.rmtree(target_path)
-                    shutil.copytree(backup_file, target_path)
+                if not entry.is_dir(follow_symlinks=False):
+                    # A hard-linked backup of an untouched file is already in place
+                    if (not entry.is_symlink() and target_path.exists()
+                            and os.path.samefile(backup_file, target_path)):
+                        continue
+                    if same_fs:
+                        os.replace(backup_file, target_path)
+                    else:
+                        if entry.is_symlink():
+                            target_path.unlink(missing_ok=True)
+                        shutil.copy2(backup_file, target_path, follow_symlinks=False)
+                else:
+                    if same_fs:
+                        # rename() won't overwrite a non-empty directory
+                        if target_path.exists():
+                            replaced_dir.mkdir(exist_ok=True)
+                            os.replace(target_path, replaced_dir / entry.name)
+                        os.replace(backup_file, target_path)
+                    else:
+                        if target_path.exists():
+                            shutil.rmtree(target_path)
+                        shutil.copytree(backup_file, target_path, symlinks=True)
             
-            print("✅ User data restored successfully")
+            self._status("✅ User data restored successfully")
             return True
             
         except Exception as e:
@@ -206,14 +599,29 @@ class NeuronAutomationUpdater:
     
     def run_update(self, force: bool = False) -> bool:
         """Run the complete update process."""
-        print("🚀 Neuron Automation Updater v{__version__}")
-        print("=" * 50)
-        
         current_version = self.get_current_version()
-        if current_version:
-            print(f"📋 Current version: {current_version}")
-        else:
-            print("📋 Current version: Unknown")
+        
+        # Emit the header block in one write
+        header = [
+            f"🚀 Neuron Automation Updater v{__version__}",
+            "=" * 50,
+            f"📋 Current version: {current_version or 'Unknown'}",
+        ]
+        if self.verbose:
+            sys.stdout.write("\n".join(header) + "\n")
+            sys.stdout.flush()
+        
+        latest_version = self.fetch_remote_version()
+        if latest_version:
+            self._status(f"📋 Latest version: {latest_version}")
+        
+        # Only an actual install counts; get_current_version() also falls
+        # back to the checkout next to this script
+        installed_script = self.config_dir / "neuron_automation.py"
+        if (not force and latest_version and installed_script.exists()
+                and self._read_version(installed_script) == latest_version):
+            print("✅ Already up to date")
+            return True
         
         if not force:
             response = input("\n🤔 Proceed with update? (y/N): ").lower()
@@ -238,6 +646,7 @@ class NeuronAutomationUpdater:
             # Step 3: Install update
             if not self.install_update(source_dir, backup_dir):
                 return False
+            self._version_cache.clear()
             
             # Step 4: Restore user data
             if not self.restore_user_data(backup_dir):
@@ -269,11 +678,16 @@ def main():
     parser = argparse.ArgumentParser(description="Update Neuron Automation system")
     parser.add_argument("--force", action="store_true", 
                        help="Skip confirmation prompts")
+    parser.add_argument("--legacy-installer", action="store_true",
+                       help="Always run the platform's shell installer")
+    parser.add_argument("--quiet", action="store_true",
+                       help="Only print warnings, errors and the result (also NEURON_QUIET=1)")
     parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
     
     args = parser.parse_args()
     
-    updater = NeuronAutomationUpdater()
+    verbose = not (args.quiet or os.environ.get("NEURON_QUIET"))
+    updater = NeuronAutomationUpdater(legacy_installer=args.legacy_installer, verbose=verbose)
     success = updater.run_update(force=args.force)
     
     sys.exit(0 if success else 1)